@@ -1,10 +1,13 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 def verify_password(plain_password, password_hash):
     return pwd_context.verify(plain_password, password_hash)
@@ -12,6 +15,66 @@ def verify_password(plain_password, password_hash):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def password_needs_rehash(password_hash):
+    # True when the hash was made with a different bcrypt cost
+    return pwd_context.needs_update(password_hash)
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so hashing proceeds in parallel with the event
+    loop; ``workers`` caps how many hashes run at once and the rest queue.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.in_flight = 0
+        self.calls = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    def _timed(self, submitted: float, fn: Callable, args: tuple):
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    async def _run(self, fn: Callable, *args: Any):
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            result, waited, took = await loop.run_in_executor(
+                self.pool, self._timed, time.perf_counter(), fn, args
+            )
+        finally:
+            self.in_flight -= 1
+        self.calls += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.hash_seconds_total += took
+        return result
+
+    async def verify(self, plain_password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, plain_password, password_hash)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.calls or 1
+        return {
+            "workers": self.workers,
+            "inFlight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "calls": self.calls,
+            "avgQueueWaitMs": round(self.wait_seconds_total / calls * 1000, 2),
+            "maxQueueWaitMs": round(self.wait_seconds_max * 1000, 2),
+            "avgHashMs": round(self.hash_seconds_total / calls * 1000, 2),
+        }
+
+password_hasher = PasswordHasher(settings.password_hash_workers)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
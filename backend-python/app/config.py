@@ -1,12 +1,104 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 import os
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     mongodb_uri: str = "mongodb://localhost:27017/mmatracker"
+    mongodb_db: str = "mma-tracker-dev"
+    # Connection pool; timeouts in milliseconds
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 10
+    mongo_max_idle_time_ms: int = 300_000
+    mongo_connect_timeout_ms: int = 5_000
+    mongo_server_selection_timeout_ms: int = 5_000
+    mongo_socket_timeout_ms: Optional[int] = None
+    # Connections opened during startup, before the app reports ready
+    mongo_warm_connections: int = 10
+    # /api/health serves the last background ping instead of pinging per probe
+    health_check_interval_seconds: float = 10
     secret_key: str = "your_secret_key"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # Password hashing; changing the cost rehashes passwords on next login
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+
+    # Workouts layout: "collection" or "timeseries" (see app/workout_storage.py)
+    workout_storage: str = "collection"
+
+    # Bulk workout import
+    import_batch_size: int = 500
+    import_max_errors: int = 1000
+    # Longest accepted line, and CSV record spanning several lines
+    import_max_line_bytes: int = 64 * 1024
+    # Rows fetched per cursor batch when exporting
+    export_batch_size: int = 1000
+
+    # Authenticated user cache
+    user_cache_size: int = 4096
+    user_cache_ttl_seconds: float = 60
+    # Build the current user from signed token claims, skipping the users lookup
+    trust_token_claims: bool = False
+
+    # Insights feed: sessions from the last N days (0 = all), newest first, capped
+    insights_window_days: int = 365
+    insights_max_sessions: int = 1000
+    insights_batch_size: int = 500
+
+    # Background insights precompute for users with new workouts
+    insights_precompute: bool = True
+    # Wait for this many quiet seconds after a write (bursts coalesce) ...
+    insights_precompute_delay_seconds: float = 2
+    # ... but never longer than this after the first unprocessed write
+    insights_precompute_max_delay_seconds: float = 30
+    insights_precompute_concurrency: int = 1
+
+    # /api/ml/insights cache
+    insights_cache_size: int = 1024
+    insights_cache_ttl_seconds: float = 300
+
+    # ML executor: "process" or "thread"
+    ml_executor: str = "process"
+    ml_workers: int = 2
+    ml_queue_size: int = 8
+    ml_job_timeout_seconds: float = 10
+    # Load pandas/scikit-learn in the ML workers right after startup
+    ml_warmup: bool = True
+
+    # Per-request profiling: send this token in X-Profile (or ?profile=)
+    # to profile one request. Empty disables profiling entirely.
+    profile_token: str = ""
+    profile_dir: str = "profiles"
+    profile_top_functions: int = 30
+
+    # Token-bucket rate limiting of expensive endpoints, per user or client IP.
+    # Each client refills rate_limit_refill_per_second tokens up to the burst;
+    # a request costs rate_limit_costs[route] tokens
+    rate_limit_enabled: bool = True
+    rate_limit_refill_per_second: float = 1
+    rate_limit_burst: float = 30
+    rate_limit_costs: Dict[str, float] = {"insights": 2, "acwr": 1, "login": 5, "register": 10}
+    # Idle buckets are dropped; this bounds memory under many distinct clients
+    rate_limit_max_keys: int = 100_000
+    # Reverse proxies (IPs or CIDRs, e.g. ["10.0.0.0/8"]) whose X-Forwarded-For
+    # is believed when keying per-IP limits. Behind a proxy that is not listed,
+    # every client shares the proxy's bucket. Running uvicorn with
+    # --proxy-headers --forwarded-allow-ips=<proxy> has the same effect.
+    rate_limit_trusted_proxies: List[str] = []
+
+    # Frontend files without a shipped .gz are gzipped in memory at startup up to this size
+    static_gzip_max_bytes: int = 2_000_000
+
+    @model_validator(mode="after")
+    def check_rate_limit_costs(self):
+        # A request costing more than a full bucket could never be admitted
+        too_costly = {k: v for k, v in self.rate_limit_costs.items() if v > self.rate_limit_burst}
+        if too_costly:
+            raise ValueError(f"rate_limit_costs {too_costly} exceed rate_limit_burst={self.rate_limit_burst}")
+        return self
+
     class Config:
         env_file = ".env" if os.path.exists(".env") else None
 
@@ -1,15 +1,71 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
 from app.config import settings
+from app.metrics import MongoCommandMetrics
+from app.workout_storage import ensure_collection, timeseries_enabled
 
 import certifi
 
+# Indexes every query path relies on, created idempotently at startup
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+    ],
+    "workouts": [
+        # Listing: userId equality, then (date, createdAt, _id) keyset order
+        IndexModel(
+            [("userId", ASCENDING), ("date", DESCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+            name="user_date_created",
+        ),
+    ],
+    "daily_loads": [
+        IndexModel([("userId", ASCENDING), ("date", ASCENDING)], unique=True, name="user_date_unique"),
+    ],
+    "weekly_stats": [
+        IndexModel([("userId", ASCENDING), ("weekStart", ASCENDING)], unique=True, name="user_week_unique"),
+    ],
+    "insights": [
+        IndexModel([("userId", ASCENDING)], unique=True, name="user_unique"),
+    ],
+    "workout_meta": [
+        IndexModel([("userId", ASCENDING)], unique=True, name="user_unique"),
+    ],
+}
+
+# The time-series layout filters and lists on "ts" (see app/workout_storage.py)
+TIMESERIES_INDEXES = {
+    "workouts": [
+        IndexModel(
+            [("userId", ASCENDING), ("ts", DESCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+            name="user_ts_created",
+        ),
+    ],
+}
+
+def active_indexes() -> Dict[str, list]:
+    return {**INDEXES, **TIMESERIES_INDEXES} if timeseries_enabled() else INDEXES
+
 class Database:
     client: AsyncIOMotorClient = None
+    # Result of the last background ping, served by /api/health
+    health: Optional[Dict[str, Any]] = None
 
     def connect(self):
         self.client = AsyncIOMotorClient(
             settings.mongodb_uri,
-            tlsCAFile=certifi.where()
+            tlsCAFile=certifi.where(),
+            event_listeners=[MongoCommandMetrics()],
+            maxPoolSize=settings.mongo_max_pool_size,
+            minPoolSize=settings.mongo_min_pool_size,
+            maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+            connectTimeoutMS=settings.mongo_connect_timeout_ms,
+            serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+            socketTimeoutMS=settings.mongo_socket_timeout_ms,
         )
         print("Connected to MongoDB")
 
@@ -19,6 +75,52 @@ class Database:
             print("Disconnected from MongoDB")
     
     def get_db(self):
-        return self.client.get_database("mma-tracker-dev")
+        return self.client.get_database(settings.mongodb_db)
+
+    async def warm(self, connections: int):
+        """Open ``connections`` pooled connections ahead of the first request.
+
+        Concurrent pings each check out their own connection, so the
+        handshake and TLS cost is paid here rather than by user traffic.
+        """
+        database = self.get_db()
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(database.command("ping") for _ in range(max(1, connections))))
+        except Exception as e:
+            print(f"MongoDB warm-up failed: {e}")
+            self.health = {"database": f"error: {e}", "checkedAt": time.time()}
+            return
+        self.health = {"database": "connected", "checkedAt": time.time()}
+        print(f"MongoDB pool warmed ({connections} connections, {(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    async def check_health(self) -> Dict[str, Any]:
+        try:
+            await self.get_db().command("ping")
+            status = "connected"
+        except Exception as e:
+            status = f"error: {e}"
+        self.health = {"database": status, "checkedAt": time.time()}
+        return self.health
+
+    async def monitor_health(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_health()
+
+    async def ensure_indexes(self):
+        database = self.get_db()
+        try:
+            # Time-series layout has to exist before the first insert creates a plain collection
+            await ensure_collection(database)
+            for collection, indexes in active_indexes().items():
+                try:
+                    await database[collection].create_indexes(indexes)
+                except OperationFailure as e:
+                    # e.g. existing duplicates block a unique index; keep serving
+                    print(f"Could not create indexes on {collection}: {e}")
+        except PyMongoError as e:
+            # Unreachable at boot: serve anyway and report it through /api/health
+            print(f"Index setup skipped: {e}")
 
 db = Database()
@@ -1,19 +1,55 @@
+from app import startup
+import asyncio
+import importlib
 import os
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from app.config import settings
 from app.database import db
+from app.ml.executor import ml_executor
+from app.ml.cache import insights_cache
+from app.ml.precompute import insights_precompute
+from app.metrics import MetricsMiddleware, register_routes, registry
+from app.auth.security import password_hasher
+from app.routes.deps import user_cache, token_cache
 from app.routes import auth, workouts, ml
+from app.static_site import StaticSite
+
+async def _warm_ml():
+    try:
+        await ml_executor.warm("app.ml.engine")
+        # ACWR runs in the web process's threads, not the pool
+        await run_in_threadpool(importlib.import_module, "app.ml.acwr")
+        startup.mark("mlWarm")
+    except Exception as e:
+        print(f"ML warm-up failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     db.connect()
+    await db.warm(settings.mongo_warm_connections)
+    startup.mark("dbWarm")
+    await db.ensure_indexes()
+    health = asyncio.create_task(db.monitor_health(settings.health_check_interval_seconds))
+    ml_executor.start()
+    # Load the ML stack in the background once the server is accepting traffic
+    warmup = asyncio.create_task(_warm_ml()) if settings.ml_warmup else None
+    precompute = asyncio.create_task(insights_precompute.run()) if settings.insights_precompute else None
+    startup.mark("ready")
+    print(f"Startup timings (ms): {startup.report()}")
     yield
     # Shutdown
+    health.cancel()
+    if warmup:
+        warmup.cancel()
+    if precompute:
+        precompute.cancel()
+    ml_executor.shutdown()
     db.disconnect()
 
 app = FastAPI(
@@ -35,43 +71,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so it times everything below it
+app.add_middleware(MetricsMiddleware)
+
 # Routes
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(workouts.router, prefix="/api/workouts", tags=["Workouts"])
 app.include_router(ml.router, prefix="/api/ml", tags=["ML"])
+register_routes("/api/auth", auth.router.routes)
+register_routes("/api/workouts", workouts.router.routes)
+register_routes("/api/ml", ml.router.routes)
+
+startup.mark("imported")
 
 @app.get("/api/health")
 async def health_check():
     import ssl
     import sys
-    try:
-        await db.get_db().command("ping")
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {e}"
+    # Probes read the cached ping; monitor_health refreshes it in the background
+    health = db.health or await db.check_health()
+    startup.mark("firstHealthy")
     return {
         "status": "healthy",
         "backend": "python-fastapi",
-        "database": db_status,
+        "database": health["database"],
+        "databaseCheckedAgoSeconds": round(time.time() - health["checkedAt"], 1),
         "python": sys.version,
         "openssl": ssl.OPENSSL_VERSION,
+        "startup": startup.report(),
     }
 
+@registry.collector
+def _runtime_samples():
+    executor = ml_executor.stats()
+    hashing = password_hasher.stats()
+    caches = {"insights": insights_cache.entries, "user": user_cache, "token": token_cache}
+    return [
+        ("cache_hits_total", "counter", "Cache hits", [({"cache": n}, c.hits) for n, c in caches.items()]),
+        ("cache_misses_total", "counter", "Cache misses", [({"cache": n}, c.misses) for n, c in caches.items()]),
+        ("cache_entries", "gauge", "Cached entries", [({"cache": n}, len(c)) for n, c in caches.items()]),
+        ("ml_executor_queue_depth", "gauge", "Insight jobs waiting for a worker", [({}, executor["queueDepth"])]),
+        ("ml_executor_running", "gauge", "Insight jobs executing", [({}, executor["running"])]),
+        ("ml_executor_jobs_total", "counter", "Insight jobs by outcome", [
+            ({"outcome": o}, executor[o]) for o in ("completed", "rejected", "timeouts", "failed")
+        ]),
+        ("insights_precompute_dirty_users", "gauge", "Users waiting for background insights", [
+            ({}, len(insights_precompute.dirty)),
+        ]),
+        ("password_hash_in_flight", "gauge", "bcrypt operations queued or running", [({}, hashing["inFlight"])]),
+        ("password_hash_calls_total", "counter", "bcrypt operations", [({}, hashing["calls"])]),
+    ]
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # Prometheus text format; rendering reads in-memory counters only
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 # Serve Frontend in Production
 
-# Mount static files if directory exists (for Docker build)
+# Index static files once if the directory exists (for Docker build)
 static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
 if os.path.exists(static_dir):
-    app.mount("/assets", StaticFiles(directory=os.path.join(static_dir, "assets")), name="assets")
-    
-    @app.get("/{full_path:path}")
-    async def serve_react_app(full_path: str):
-        # API routes are already handled above due to order
-        # If file exists in static, serve it (e.g. favicon.ico)
-        possible_file = os.path.join(static_dir, full_path)
-        if os.path.isfile(possible_file):
-             return FileResponse(possible_file)
-        
-        # Otherwise serve index.html for React Router
-        return FileResponse(os.path.join(static_dir, "index.html"))
+    static_site = StaticSite(static_dir, gzip_max_bytes=settings.static_gzip_max_bytes)
+    startup.mark("staticIndexed")
+    print(f"Static files indexed: {static_site.stats()}")
 
+    # HEAD too, as StaticFiles answered it (link checkers, uptime probes)
+    @app.api_route("/{full_path:path}", methods=["GET", "HEAD"])
+    async def serve_react_app(full_path: str, request: Request):
+        # API routes are already handled above due to order.
+        # Unknown paths get index.html for React Router
+        return static_site.response(
+            full_path,
+            accept_encoding=request.headers.get("accept-encoding", ""),
+            if_none_match=request.headers.get("if-none-match", ""),
+        )
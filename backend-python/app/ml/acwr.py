@@ -0,0 +1,62 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from app.ml.load import ACUTE_EWMA_LAMBDA, ACUTE_WINDOW, CHRONIC_EWMA_LAMBDA, CHRONIC_WINDOW
+
+# Daily ACWR series over a dense per-day load array. Both variants are O(n)
+# for the whole range: rolling averages come from a single cumulative sum,
+# EWMAs from a first-order recursive filter.
+
+def rolling_mean(load: np.ndarray, window: int) -> np.ndarray:
+    # Days before the array count as rest days, as in burnout_from_daily_loads
+    cumulative = np.concatenate(([0.0], np.cumsum(load)))
+    end = np.arange(1, len(load) + 1)
+    return (cumulative[end] - cumulative[np.maximum(end - window, 0)]) / window
+
+def ewma(load: np.ndarray, decay: float) -> np.ndarray:
+    # y[t] = decay * x[t] + r * y[t - 1] with r = 1 - decay, solved a block
+    # at a time: y[j] = r^j * (decay * cumsum(x[k] * r^-k) + r * y[-1]).
+    # Blocks are short enough that r^-k stays below 1e30.
+    r = 1.0 - decay
+    block = max(1, min(len(load), int(-30 / np.log10(r))))
+    k = np.arange(block)
+    up, down = r ** -k, r ** k
+    out = np.empty(len(load))
+    prev = 0.0
+    for start in range(0, len(load), block):
+        x = load[start:start + block]
+        n = len(x)
+        out[start:start + n] = down[:n] * (decay * np.cumsum(x * up[:n]) + r * prev)
+        prev = out[start + n - 1]
+    return out
+
+def _ratio(acute: np.ndarray, chronic: np.ndarray) -> np.ndarray:
+    # Undefined (null) until there is any chronic load
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(chronic > 0, acute / (chronic + 1e-6), np.nan)
+
+def _values(series: np.ndarray, skip: int) -> List[Optional[float]]:
+    values = np.round(series[skip:], 3)
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    return np.where(missing, None, values.astype(object)).tolist()
+
+def acwr_series(load: Sequence[float], skip: int = 0) -> Dict[str, List[Optional[float]]]:
+    """Acute/chronic load and ACWR for every day of ``load``.
+
+    The first ``skip`` days only warm up the windows and are not returned.
+    """
+    x = np.asarray(load, dtype=np.float64)
+    acute = rolling_mean(x, ACUTE_WINDOW)
+    chronic = rolling_mean(x, CHRONIC_WINDOW)
+    acute_ewma = ewma(x, ACUTE_EWMA_LAMBDA)
+    chronic_ewma = ewma(x, CHRONIC_EWMA_LAMBDA)
+    return {
+        "load": _values(x, skip),
+        "acute": _values(acute, skip),
+        "chronic": _values(chronic, skip),
+        "acwr": _values(_ratio(acute, chronic), skip),
+        "acuteEwma": _values(acute_ewma, skip),
+        "chronicEwma": _values(chronic_ewma, skip),
+        "acwrEwma": _values(_ratio(acute_ewma, chronic_ewma), skip),
+    }
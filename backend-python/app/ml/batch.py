@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+from app.ml.engine import ALL_DISCIPLINES, STRIKING, GRAPPLING
+from app.ml.load import ACUTE_WINDOW, CHRONIC_WINDOW, assess_acwr
+
+# Cohort-wide analytics: the same burnout, weakness and focus rules as
+# MLEngine, computed for many users at once with groupby instead of one
+# engine per user.
+
+BATCH_FIELDS = ["userId", "date", "discipline", "duration", "intensity"]
+
+def _weakness(pct: pd.Series) -> str:
+    neglected = [d for d in ALL_DISCIPLINES if pct.get(d, 0) == 0]
+    if neglected:
+        return f"Consider trying: {', '.join(neglected[:3])}"
+
+    underrepresented = sorted(
+        ((d, pct[d]) for d in ALL_DISCIPLINES if pct[d] < 10),
+        key=lambda x: x[1],
+    )
+    if underrepresented:
+        weak_areas = [f"{d} ({p:.0f}%)" for d, p in underrepresented[:3]]
+        return f"Underrepresented areas: {', '.join(weak_areas)}"
+    return ""
+
+def cohort_report(columns: Dict[str, List[Any]]) -> pd.DataFrame:
+    """One report row per user from column-oriented workout data.
+
+    ``columns`` maps each name in BATCH_FIELDS to a list of values.
+    """
+    df = pd.DataFrame(columns, columns=BATCH_FIELDS)
+    if df.empty:
+        return pd.DataFrame()
+
+    df["userId"] = df["userId"].astype(str)
+    df["day"] = pd.to_datetime(df["date"].astype(str).str[:10])
+    df["load"] = df["duration"] * df["intensity"]
+
+    users = df.groupby("userId").agg(
+        sessions=("day", "size"),
+        firstDate=("day", "min"),
+        lastDate=("day", "max"),
+    )
+
+    # Daily load, positioned relative to each user's most recent day
+    daily = df.groupby(["userId", "day"], as_index=False)["load"].sum()
+    daily = daily.join(users["lastDate"], on="userId")
+    offset = (daily["lastDate"] - daily["day"]).dt.days
+    daily["acute"] = daily["load"].where(offset < ACUTE_WINDOW, 0)
+    daily["chronic"] = daily["load"].where(offset < CHRONIC_WINDOW, 0)
+    windows = daily.groupby("userId")[["acute", "chronic"]].sum()
+
+    users["acuteLoad"] = windows["acute"] / ACUTE_WINDOW
+    users["chronicLoad"] = windows["chronic"] / CHRONIC_WINDOW
+    users["acwr"] = users["acuteLoad"] / (users["chronicLoad"] + 1e-6)
+    span = (users["lastDate"] - users["firstDate"]).dt.days + 1
+
+    burnout = [
+        {"risk": "Unknown", "reason": "Not enough data", "acwr": np.nan} if sessions < 5
+        else {"risk": "Low", "reason": "Building baseline", "acwr": np.nan} if days < CHRONIC_WINDOW
+        else assess_acwr(float(acwr))
+        for sessions, days, acwr in zip(users["sessions"], span, users["acwr"])
+    ]
+    users["acwr"] = [b["acwr"] for b in burnout]
+    users["risk"] = [b["risk"] for b in burnout]
+    users["reason"] = [b["reason"] for b in burnout]
+
+    # Discipline distribution as % of total training time
+    duration = df.pivot_table(
+        index="userId", columns="discipline", values="duration", aggfunc="sum", fill_value=0
+    )
+    pct = duration.div(duration.sum(axis=1), axis=0).mul(100)
+    pct = pct.reindex(columns=ALL_DISCIPLINES, fill_value=0)
+    users["weakness"] = [_weakness(row) for _, row in pct.iterrows()]
+
+    # Striking vs grappling balance by session count
+    counts = df.pivot_table(
+        index="userId", columns="discipline", values="day", aggfunc="size", fill_value=0
+    ).reindex(columns=ALL_DISCIPLINES, fill_value=0)
+    striking = counts[STRIKING].sum(axis=1)
+    grappling = counts[GRAPPLING].sum(axis=1)
+    users["focus"] = np.select(
+        [striking > grappling * 2, grappling > striking * 2],
+        ["Grappling (Balance)", "Striking (Balance)"],
+        default="Maintain Mix",
+    )
+
+    for d in ALL_DISCIPLINES:
+        users[f"pct_{d}"] = pct[d].round(1)
+
+    users["firstDate"] = users["firstDate"].dt.strftime("%Y-%m-%d")
+    users["lastDate"] = users["lastDate"].dt.strftime("%Y-%m-%d")
+    users["acuteLoad"] = users["acuteLoad"].round(2)
+    users["chronicLoad"] = users["chronicLoad"].round(2)
+    return users.reset_index()
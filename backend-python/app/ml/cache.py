@@ -0,0 +1,47 @@
+import itertools
+from typing import Any, Dict, Optional
+from app.cache import TTLCache
+from app.config import settings
+
+class InsightsCache:
+    """Insights keyed by (user, data version).
+
+    Workout writes call ``bump`` so entries computed from older data are
+    never served again; they simply age out of the LRU.
+
+    Versions are drawn from one process-wide counter and kept in a bounded
+    cache of their own. A user whose version was evicted gets a fresh,
+    never-used number, so no entry from before the eviction can match.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl)
+        self.versions = TTLCache(maxsize, ttl)
+        self._counter = itertools.count(1)
+
+    def version(self, user_id: Any) -> int:
+        key = str(user_id)
+        version = self.versions.get(key)
+        if version is None:
+            version = next(self._counter)
+            self.versions.set(key, version)
+        return version
+
+    def bump(self, user_id: Any):
+        self.versions.set(str(user_id), next(self._counter))
+
+    def get(self, user_id: Any) -> Optional[Dict[str, Any]]:
+        return self.entries.get((str(user_id), self.version(user_id)))
+
+    def set(self, user_id: Any, insights: Dict[str, Any], version: Optional[int] = None):
+        if version is None:
+            version = self.version(user_id)
+        self.entries.set((str(user_id), version), insights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.entries.stats(), "trackedUsers": len(self.versions)}
+
+insights_cache = InsightsCache(
+    maxsize=settings.insights_cache_size,
+    ttl=settings.insights_cache_ttl_seconds,
+)
@@ -0,0 +1,84 @@
+import numpy as np
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping
+from app.ml.load import ACUTE_WINDOW, CHRONIC_WINDOW, assess_acwr
+
+if TYPE_CHECKING:
+    from app.ml.feed import ColumnFeed
+
+# Array-backed workouts for the pandas-free MLEngine path.
+
+@dataclass
+class WorkoutColumns:
+    day: np.ndarray         # int64 days since epoch
+    duration: np.ndarray    # int64 minutes
+    intensity: np.ndarray   # int64 1-10
+    discipline: np.ndarray  # int64 codes into ``disciplines``
+    disciplines: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, workouts: Iterable[Mapping[str, Any]]) -> "WorkoutColumns":
+        codes: Dict[str, int] = {}
+        days, durations, intensities, disciplines = [], [], [], []
+        for w in workouts:
+            days.append(str(w["date"])[:10])
+            durations.append(w["duration"])
+            intensities.append(w["intensity"])
+            disciplines.append(codes.setdefault(w["discipline"], len(codes)))
+        return cls(
+            day=np.array(days, dtype="datetime64[D]").astype(np.int64),
+            duration=np.array(durations, dtype=np.int64),
+            intensity=np.array(intensities, dtype=np.int64),
+            discipline=np.array(disciplines, dtype=np.int64),
+            disciplines=list(codes),
+        )
+
+    @classmethod
+    def from_feed(cls, feed: "ColumnFeed") -> "WorkoutColumns":
+        # Feeds arrive newest first; keep chronological order like from_records
+        return cls(
+            day=np.frombuffer(feed.day, dtype=np.int64)[::-1].copy(),
+            duration=np.frombuffer(feed.duration, dtype=np.int64)[::-1].copy(),
+            intensity=np.frombuffer(feed.intensity, dtype=np.int64)[::-1].copy(),
+            discipline=np.frombuffer(feed.discipline, dtype=np.int64)[::-1].copy(),
+            disciplines=feed.disciplines,
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        dates = self.day.astype("datetime64[D]").astype(str)
+        return [
+            {"date": d, "discipline": self.disciplines[c], "duration": int(m), "intensity": int(i)}
+            for d, c, m, i in zip(dates, self.discipline, self.duration, self.intensity)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    @property
+    def load(self) -> np.ndarray:
+        return self.duration * self.intensity
+
+    def discipline_durations(self) -> Dict[str, float]:
+        totals = np.bincount(self.discipline, weights=self.duration, minlength=len(self.disciplines))
+        return dict(zip(self.disciplines, totals.tolist()))
+
+    def discipline_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.discipline, minlength=len(self.disciplines))
+        return dict(zip(self.disciplines, counts.tolist()))
+
+    def daily_load(self) -> np.ndarray:
+        # Dense per-day totals from the first to the last training day
+        return np.bincount(self.day - self.day.min(), weights=self.load)
+
+def predict_burnout(columns: WorkoutColumns) -> Dict[str, Any]:
+    if len(columns) < 5:
+        return {"risk": "Unknown", "reason": "Not enough data"}
+
+    daily = columns.daily_load()
+    if len(daily) < CHRONIC_WINDOW:
+        return {"risk": "Low", "reason": "Building baseline"}
+
+    cumulative = np.concatenate(([0.0], np.cumsum(daily)))
+    acute = (cumulative[-1] - cumulative[-1 - ACUTE_WINDOW]) / ACUTE_WINDOW
+    chronic = (cumulative[-1] - cumulative[-1 - CHRONIC_WINDOW]) / CHRONIC_WINDOW
+    return assess_acwr(float(acute / (chronic + 1e-6)))
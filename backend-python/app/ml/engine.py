@@ -1,41 +1,102 @@
+import time
 import pandas as pd
 import numpy as np
+from functools import wraps
 from sklearn.cluster import KMeans
-from sklearn.linear_model import Ridge
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
+from app.ml import columnar
+from app.ml.columnar import WorkoutColumns
+from app.ml.feed import ColumnFeed
+from app.ml.load import assess_acwr
+
+ALL_DISCIPLINES = [
+    'Boxing', 'Wrestling', 'BJJ', 'Muay Thai', 
+    'Strength & Conditioning', 'Cardio', 'Mobility', 
+    'Sprints'
+]
+STRIKING = ['Boxing', 'Muay Thai']
+GRAPPLING = ['Wrestling', 'BJJ']
+
+# NumPy path for typical histories; pandas above this size
+FAST_PATH_MAX_ROWS = 10_000
+
+def timed(method):
+    # Records the stage's run time in engine.timings for the metrics endpoint
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.timings[method.__name__.strip("_")] = time.perf_counter() - start
+    return wrapper
 
 class MLEngine:
-    def __init__(self, workouts: List[Dict[str, Any]]):
-        self.df = pd.DataFrame(workouts)
-        if not self.df.empty:
+    @timed
+    def __init__(
+        self,
+        workouts: Union[List[Dict[str, Any]], WorkoutColumns],
+        fast_path_max_rows: int = FAST_PATH_MAX_ROWS,
+    ):
+        self.timings: Dict[str, float] = {}
+        self.size = len(workouts)
+        self.columns: Optional[WorkoutColumns] = None
+        self._df = None
+        self._workouts = workouts
+        if isinstance(workouts, WorkoutColumns):
+            # Already columnar (insights feed); records are only rebuilt if df is asked for
+            self.columns = workouts
+            self._workouts = None
+        elif self.size < fast_path_max_rows:
+            self.columns = WorkoutColumns.from_records(workouts)
+        else:
+            self._df = self._build_df(workouts)
+
+    @staticmethod
+    def _build_df(workouts: List[Dict[str, Any]]) -> pd.DataFrame:
+        df = pd.DataFrame(workouts)
+        if not df.empty:
             # Convert date to datetime
-            self.df['date'] = pd.to_datetime(self.df['date'])
+            df['date'] = pd.to_datetime(df['date'])
             # Calculate load
-            self.df['load'] = self.df['duration'] * self.df['intensity']
+            df['load'] = df['duration'] * df['intensity']
+        return df
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # Built on demand when the engine took the NumPy path
+        if self._df is None:
+            records = self._workouts if self._workouts is not None else self.columns.to_records()
+            self._df = self._build_df(records)
+        return self._df
 
+    @df.setter
+    def df(self, value: pd.DataFrame):
+        self._df = value
+
+    @timed
     def analyze_weaknesses(self) -> List[str]:
-        if self.df.empty:
+        if self.size == 0:
             return ["No data available to analyze weaknesses."]
         
         # Simple distribution analysis: Least trained disciplines
-        discipline_stats = self.df.groupby('discipline')['duration'].sum()
-        all_disciplines = [
-            'Boxing', 'Wrestling', 'BJJ', 'Muay Thai', 
-            'Strength & Conditioning', 'Cardio', 'Mobility', 
-            'Sprints'
-        ]
+        if self.columns is not None:
+            discipline_stats = self.columns.discipline_durations()
+        else:
+            discipline_stats = self.df.groupby('discipline')['duration'].sum().to_dict()
+        all_disciplines = ALL_DISCIPLINES
         
         insights = []
         
         # 1. Identify neglected disciplines (never tried)
-        trained_disciplines = discipline_stats.index.tolist()
+        trained_disciplines = list(discipline_stats)
         neglected = [d for d in all_disciplines if d not in trained_disciplines]
         
         if neglected:
             insights.append(f"Consider trying: {', '.join(neglected[:3])}")
         else:
             # 2. Identify underrepresented disciplines (< 10% of total time)
-            total_duration = discipline_stats.sum()
+            total_duration = sum(discipline_stats.values())
             underrepresented = []
             for d in all_disciplines:
                 d_duration = discipline_stats.get(d, 0)
@@ -51,12 +112,16 @@ class MLEngine:
         
         # 2. Identify 'High Intensity, Low Duration' vs 'Low Intensity, High Duration' outliers
         # We can use clustering here if we have enough data (e.g. > 10 workouts)
-        if len(self.df) > 10:
+        if self.size > 10:
             # Feature engineering for clustering
             # We want to cluster sessions to see if there's a pattern user is stuck in
-            features = self.df[['duration', 'intensity']]
             kmeans = KMeans(n_clusters=3, random_state=42, n_init='auto')
-            self.df['cluster'] = kmeans.fit_predict(features)
+            if self.columns is not None:
+                features = np.column_stack((self.columns.duration, self.columns.intensity))
+                kmeans.fit(features)
+            else:
+                features = self.df[['duration', 'intensity']]
+                self.df['cluster'] = kmeans.fit_predict(features)
             
             # Check cluster centers
             centers = kmeans.cluster_centers_
@@ -70,7 +135,11 @@ class MLEngine:
 
         return insights
 
+    @timed
     def predict_burnout(self) -> Dict[str, Any]:
+        if self.columns is not None:
+            return columnar.predict_burnout(self.columns)
+
         if len(self.df) < 5:
             return {"risk": "Unknown", "reason": "Not enough data"}
             
@@ -90,31 +159,25 @@ class MLEngine:
              return {"risk": "Low", "reason": "Building baseline"}
 
         current_acwr = rolling_7.iloc[-1] / (rolling_28.iloc[-1] + 1e-6) # avoid div by zero
+
+        return assess_acwr(float(current_acwr))
         
-        risk = "Low"
-        reason = "Training load is balanced."
-        
-        if current_acwr > 1.5:
-            risk = "High"
-            reason = f"Acute load is {current_acwr:.2f}x your chronic load. High injury risk! Taper recommended."
-        elif current_acwr > 1.2:
-            risk = "Moderate"
-            reason = f"Training load is ramping up ({current_acwr:.2f}x). Monitor fatigue."
-            
-        return {"risk": risk, "reason": reason, "acwr": round(current_acwr, 2)}
-        
+    @timed
     def get_recommended_focus(self) -> str:
-        if self.df.empty:
+        if self.size == 0:
             return "General Conditioning"
             
         # Suggest balancing the mix
         # If striker -> suggest grappling
         # If grappler -> suggest striking
         
-        striking = ['Boxing', 'Muay Thai']
-        grappling = ['Wrestling', 'BJJ']
+        striking = STRIKING
+        grappling = GRAPPLING
         
-        counts = self.df['discipline'].value_counts()
+        if self.columns is not None:
+            counts = self.columns.discipline_counts()
+        else:
+            counts = self.df['discipline'].value_counts()
         
         striking_count = sum(counts.get(d, 0) for d in striking)
         grappling_count = sum(counts.get(d, 0) for d in grappling)
@@ -126,3 +189,15 @@ class MLEngine:
             
         return "Maintain Mix"
 
+
+def compute_insights(workouts: Union[List[Dict[str, Any]], ColumnFeed]) -> Dict[str, Any]:
+    # Module-level so it can be shipped to a process pool
+    if isinstance(workouts, ColumnFeed):
+        workouts = WorkoutColumns.from_feed(workouts)
+    engine = MLEngine(workouts)
+    return {
+        "weaknesses": engine.analyze_weaknesses(),
+        "focus": engine.get_recommended_focus(),
+        # Stage timings travel back with the result; the pool may be another process
+        "timings": engine.timings,
+    }
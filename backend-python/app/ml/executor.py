@@ -0,0 +1,169 @@
+import asyncio
+import importlib
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Union
+from app.config import settings
+
+class QueueFullError(Exception):
+    pass
+
+def _resolve(fn: Union[Callable, str]) -> Callable:
+    # "module:function" targets are imported inside the worker, so the web
+    # process never has to load pandas/scikit-learn itself
+    if isinstance(fn, str):
+        module, name = fn.split(":")
+        return getattr(importlib.import_module(module), name)
+    return fn
+
+def _timed_call(fn: Union[Callable, str], args: tuple):
+    # Runs in the worker; report execution time separately from queue wait
+    start = time.perf_counter()
+    result = _resolve(fn)(*args)
+    return result, time.perf_counter() - start
+
+def _import(module: str):
+    importlib.import_module(module)
+
+class MLExecutor:
+    """Runs CPU-bound ML jobs off the event loop.
+
+    At most ``workers`` jobs execute at once and at most ``queue_size`` more
+    may wait; anything beyond that is rejected with QueueFullError.
+    """
+
+    def __init__(self, kind: str, workers: int, queue_size: int, timeout: float):
+        self.kind = kind
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.pool: Optional[Executor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failed = 0
+        self.restarts = 0
+        self.exec_seconds_total = 0.0
+        self.exec_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    def start(self):
+        if self.pool is not None:
+            return
+        if self.kind == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ml")
+        else:
+            # spawn: forking a process that already runs the Motor client is unsafe
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        print(f"ML executor started ({self.kind}, {self.workers} workers)")
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def _release(self, future):
+        self.in_flight -= 1
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.failed += 1
+            return
+        _, exec_seconds = future.result()
+        self.completed += 1
+        self.exec_seconds_total += exec_seconds
+        self.exec_seconds_max = max(self.exec_seconds_max, exec_seconds)
+
+    async def warm(self, *modules: str):
+        """Import ``modules`` in every worker ahead of the first real job."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        for module in modules:
+            await asyncio.gather(*(
+                loop.run_in_executor(self.pool, _import, module)
+                for _ in range(self.workers)
+            ))
+
+    def _restart(self, broken: Executor):
+        # A dead process worker breaks the whole pool; only the first caller
+        # to notice replaces it
+        if self.pool is broken:
+            print("ML executor pool broke; starting a new one")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            self.restarts += 1
+            self.start()
+
+    async def _submit(self, fn: Union[Callable, str], args: tuple) -> Any:
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            future = self.pool.submit(_timed_call, fn, args)
+        except BrokenProcessPool:
+            self.in_flight -= 1
+            raise
+        # Slot is released when the job really finishes, not when the caller
+        # gives up waiting on it
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._release, f))
+
+        try:
+            result, exec_seconds = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            future.cancel() # only succeeds if the job has not started yet
+            raise
+
+        self.wait_seconds_total += max(0.0, time.perf_counter() - submitted - exec_seconds)
+        return result
+
+    async def run(self, fn: Union[Callable, str], *args: Any) -> Any:
+        if self.in_flight >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise QueueFullError("ML queue is full")
+
+        self.start()
+        pool = self.pool
+        try:
+            return await self._submit(fn, args)
+        except BrokenProcessPool:
+            # Retry once on a fresh pool; a job that kills its worker twice fails
+            self._restart(pool)
+            return await self._submit(fn, args)
+
+    def stats(self) -> Dict[str, Any]:
+        done = self.completed or 1
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queueSize": self.queue_size,
+            "running": min(self.in_flight, self.workers),
+            "queueDepth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "avgExecMs": round(self.exec_seconds_total / done * 1000, 2),
+            "maxExecMs": round(self.exec_seconds_max * 1000, 2),
+            "avgQueueWaitMs": round(self.wait_seconds_total / done * 1000, 2),
+        }
+
+ml_executor = MLExecutor(
+    kind=settings.ml_executor,
+    workers=settings.ml_workers,
+    queue_size=settings.ml_queue_size,
+    timeout=settings.ml_job_timeout_seconds,
+)
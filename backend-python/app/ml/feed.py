@@ -0,0 +1,58 @@
+from array import array
+from datetime import date, timedelta
+from typing import Any, Dict, Mapping, Optional
+from app.workout_storage import time_field, time_key
+
+# Insights data feed: the recency window of a user's workouts, projected to
+# the fields the engine reads and packed into flat column buffers as the
+# cursor yields each batch. No list of full documents is ever built, and
+# the buffers pickle to a fraction of the size of dicts when shipped to an
+# ML worker. Free of NumPy and the database client, so it imports cheaply
+# on both sides of the pool.
+
+FEED_PROJECTION = {"_id": 0, "date": 1, "discipline": 1, "duration": 1, "intensity": 1}
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+class ColumnFeed:
+    def __init__(self):
+        self.day = array("q")        # days since epoch
+        self.duration = array("q")
+        self.intensity = array("q")
+        self.discipline = array("q")  # codes into ``disciplines``
+        self.codes: Dict[str, int] = {}
+
+    def append(self, w: Mapping[str, Any]):
+        self.day.append(date.fromisoformat(str(w["date"])[:10]).toordinal() - _EPOCH)
+        self.duration.append(w["duration"])
+        self.intensity.append(w["intensity"])
+        self.discipline.append(self.codes.setdefault(w["discipline"], len(self.codes)))
+
+    @property
+    def disciplines(self):
+        return list(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+async def load_feed(
+    workouts,
+    user_id: str,
+    window_days: int,
+    max_sessions: int,
+    batch_size: int,
+    today: Optional[date] = None,
+) -> ColumnFeed:
+    """Most recent sessions first: within ``window_days`` (0 = no limit), at most ``max_sessions``."""
+    query: Dict[str, Any] = {"userId": user_id}
+    if window_days > 0:
+        cutoff = ((today or date.today()) - timedelta(days=window_days)).isoformat()
+        query[time_field()] = {"$gte": time_key(cutoff)}
+    cursor = workouts.find(query, projection=FEED_PROJECTION)
+    # Walks the (userId, date or ts desc, ...) index; no in-memory sort
+    cursor.sort(time_field(), -1).limit(max_sessions).batch_size(batch_size)
+
+    feed = ColumnFeed()
+    async for w in cursor:
+        feed.append(w)
+    return feed
@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+from typing import Dict, Any, Mapping
+
+# Acute:Chronic Workload Ratio windows (days)
+ACUTE_WINDOW = 7
+CHRONIC_WINDOW = 28
+
+# EWMA decay factors, lambda = 2 / (N + 1) (Williams et al., 2017)
+ACUTE_EWMA_LAMBDA = 2 / (ACUTE_WINDOW + 1)
+CHRONIC_EWMA_LAMBDA = 2 / (CHRONIC_WINDOW + 1)
+# History read ahead of a requested ACWR range so its first values are
+# settled: the chronic EWMA keeps < 1e-5 of its starting value after this
+ACWR_WARMUP_DAYS = 6 * CHRONIC_WINDOW
+
+def workout_day(workout: Mapping[str, Any]) -> str:
+    # Workouts store their date as YYYY-MM-DD, anything after that is ignored
+    return str(workout["date"])[:10]
+
+def workout_load(workout: Mapping[str, Any]) -> float:
+    return workout["duration"] * workout["intensity"]
+
+def assess_acwr(current_acwr: float) -> Dict[str, Any]:
+    # A ratio > 1.3 - 1.5 indicates high injury risk
+    risk = "Low"
+    reason = "Training load is balanced."
+
+    if current_acwr > 1.5:
+        risk = "High"
+        reason = f"Acute load is {current_acwr:.2f}x your chronic load. High injury risk! Taper recommended."
+    elif current_acwr > 1.2:
+        risk = "Moderate"
+        reason = f"Training load is ramping up ({current_acwr:.2f}x). Monitor fatigue."
+
+    return {"risk": risk, "reason": reason, "acwr": round(current_acwr, 2)}
+
+def burnout_from_daily_loads(
+    daily_loads: Mapping[str, float],
+    first_day: str,
+    last_day: str,
+) -> Dict[str, Any]:
+    """Burnout risk from per-day load totals.
+
+    Only the CHRONIC_WINDOW days ending at ``last_day`` are read from
+    ``daily_loads``; days without an entry count as rest days.
+    """
+    last = date.fromisoformat(last_day)
+    span = (last - date.fromisoformat(first_day)).days + 1
+
+    if span < CHRONIC_WINDOW:
+        # Fallback if not enough history for ACWR
+        return {"risk": "Low", "reason": "Building baseline"}
+
+    window = [
+        daily_loads.get((last - timedelta(days=i)).isoformat(), 0)
+        for i in range(CHRONIC_WINDOW)
+    ]
+    acute = sum(window[:ACUTE_WINDOW]) / ACUTE_WINDOW
+    chronic = sum(window) / CHRONIC_WINDOW
+
+    return assess_acwr(acute / (chronic + 1e-6)) # avoid div by zero
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.config import settings
+from app.database import db
+from app.metrics import ML_STAGE
+from app.ml import rollups
+from app.ml.cache import insights_cache
+from app.ml.executor import QueueFullError, ml_executor
+from app.ml.feed import ColumnFeed, load_feed
+
+# Insights computed off the request path and stored per user:
+#
+#   insights: {userId, insights, basedOn, computedAt}
+#
+# ``basedOn`` is the user's workout_meta.lastWriteAt when the computation
+# started, so a stored result is stale as soon as a later write lands.
+# Workout writes mark the user dirty; the precompute worker waits for the
+# user to go quiet, so an import or a burst of edits costs a single run.
+
+Runner = Callable[[ColumnFeed], Awaitable[Dict[str, Any]]]
+
+async def _run_engine(feed: ColumnFeed) -> Dict[str, Any]:
+    return await ml_executor.run("app.ml.engine:compute_insights", feed)
+
+def _utc(value: datetime) -> datetime:
+    # Mongo hands back naive UTC datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+async def compute_and_store(user_id: str, run: Runner = _run_engine) -> Dict[str, Any]:
+    version = insights_cache.version(user_id)
+    based_on = await rollups.last_write_at(user_id)
+
+    feed = await load_feed(
+        db.get_db().workouts,
+        user_id,
+        window_days=settings.insights_window_days,
+        max_sessions=settings.insights_max_sessions,
+        batch_size=settings.insights_batch_size,
+    )
+    analysis = await run(feed)
+    for stage, seconds in analysis["timings"].items():
+        ML_STAGE.observe(seconds, stage=stage)
+
+    insights = {
+        "weaknesses": analysis["weaknesses"],
+        # Burnout is read from the maintained daily-load rollups
+        "burnout": await rollups.get_burnout(user_id),
+        "focus": analysis["focus"],
+    }
+    computed_at = datetime.now(timezone.utc)
+    await db.get_db().insights.replace_one(
+        {"userId": user_id},
+        {"userId": user_id, "insights": insights, "basedOn": based_on, "computedAt": computed_at},
+        upsert=True,
+    )
+
+    result = {**insights, "stale": False, "computedAt": computed_at.isoformat()}
+    # Store under the version we started from, so a write that lands
+    # mid-computation is not masked
+    insights_cache.set(user_id, result, version=version)
+    return result
+
+async def load_stored(user_id: str) -> Optional[Dict[str, Any]]:
+    stored = await db.get_db().insights.find_one({"userId": user_id}, projection={"_id": 0})
+    if stored is None:
+        return None
+    last_write = await rollups.last_write_at(user_id)
+    return {
+        **stored["insights"],
+        "stale": stored.get("basedOn") != last_write,
+        "computedAt": _utc(stored["computedAt"]).isoformat(),
+    }
+
+class InsightsPrecomputer:
+    """Recomputes insights for dirty users in the background.
+
+    A user is picked up once no write has landed for ``delay`` seconds, or
+    ``max_delay`` seconds after the first unprocessed write, whichever
+    comes first. At most ``concurrency`` users are computed at once, which
+    leaves ML pool capacity for on-demand requests.
+    """
+
+    def __init__(self, delay: float, max_delay: float, concurrency: int):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.concurrency = concurrency
+        # user id -> (first, latest) monotonic mark times
+        self.dirty: Dict[str, Tuple[float, float]] = {}
+        self.computed = 0
+        self.retried = 0
+        self.failed = 0
+        self._wake = asyncio.Event()
+
+    def mark_dirty(self, user_id: Any, immediate: bool = False):
+        key = str(user_id)
+        now = time.monotonic()
+        if immediate:
+            # Already known stale; refresh without waiting for quiet
+            now -= self.max_delay
+        first, _ = self.dirty.get(key, (now, now))
+        self.dirty[key] = (min(first, now), now)
+        self._wake.set()
+
+    def _due_at(self, marks: Tuple[float, float]) -> float:
+        first, latest = marks
+        return min(latest + self.delay, first + self.max_delay)
+
+    async def _refresh(self, user_id: str, slots: asyncio.Semaphore):
+        async with slots:
+            try:
+                await compute_and_store(user_id)
+                self.computed += 1
+            except QueueFullError:
+                # Pool is busy serving requests; try again after another delay
+                self.retried += 1
+                self.dirty.setdefault(user_id, (time.monotonic(), time.monotonic()))
+                self._wake.set()
+            except Exception as e:
+                self.failed += 1
+                print(f"Insights precompute failed for {user_id}: {e}")
+
+    async def run(self):
+        # Bound to the running loop, not the one (if any) at import time
+        self._wake = asyncio.Event()
+        slots = asyncio.Semaphore(self.concurrency)
+        while True:
+            now = time.monotonic()
+            due = [u for u, marks in self.dirty.items() if self._due_at(marks) <= now]
+            if due:
+                for user_id in due:
+                    del self.dirty[user_id]
+                await asyncio.gather(*(self._refresh(u, slots) for u in due))
+                continue
+
+            wait = min((self._due_at(m) - now for m in self.dirty.values()), default=None)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "dirtyUsers": len(self.dirty),
+            "computed": self.computed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+insights_precompute = InsightsPrecomputer(
+    delay=settings.insights_precompute_delay_seconds,
+    max_delay=settings.insights_precompute_max_delay_seconds,
+    concurrency=settings.insights_precompute_concurrency,
+)
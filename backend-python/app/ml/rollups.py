@@ -0,0 +1,168 @@
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Any, Iterable, List, Mapping, Optional
+from fastapi import Request
+from pymongo import UpdateOne
+from app.database import db
+from app.ml.load import CHRONIC_WINDOW, burnout_from_daily_loads, workout_day, workout_load
+
+# Per-user daily load rollups.
+#
+# daily_loads:  one document per (userId, date) with the summed load and
+#               session count for that day.
+# workout_meta: one document per user with the total session count and
+#               the time of the last workout write (lastWriteAt).
+#
+# Both are maintained by the workout write routes so burnout checks only
+# ever read the last CHRONIC_WINDOW days instead of the full history.
+
+def _day_deltas(
+    removed: Iterable[Mapping[str, Any]],
+    added: Iterable[Mapping[str, Any]],
+) -> Dict[str, Dict[str, float]]:
+    deltas: Dict[str, Dict[str, float]] = defaultdict(lambda: {"load": 0, "sessions": 0})
+    for w in removed:
+        day = deltas[workout_day(w)]
+        day["load"] -= workout_load(w)
+        day["sessions"] -= 1
+    for w in added:
+        day = deltas[workout_day(w)]
+        day["load"] += workout_load(w)
+        day["sessions"] += 1
+    return {d: v for d, v in deltas.items() if v["load"] or v["sessions"]}
+
+async def apply_workout_changes(
+    user_id: str,
+    removed: Iterable[Mapping[str, Any]] = (),
+    added: Iterable[Mapping[str, Any]] = (),
+):
+    removed, added = list(removed), list(added)
+    deltas = _day_deltas(removed, added)
+    database = db.get_db()
+
+    await database.workout_meta.update_one(
+        {"userId": user_id},
+        {
+            "$inc": {"sessions": len(added) - len(removed)},
+            "$set": {"lastWriteAt": datetime.now(timezone.utc)},
+        },
+        upsert=True,
+    )
+    if not deltas:
+        return
+
+    await database.daily_loads.bulk_write([
+        UpdateOne(
+            {"userId": user_id, "date": day},
+            {"$inc": {"load": delta["load"], "sessions": delta["sessions"]}},
+            upsert=True,
+        )
+        for day, delta in deltas.items()
+    ], ordered=False)
+
+    if any(delta["sessions"] < 0 for delta in deltas.values()):
+        # Drop days that no longer have any sessions
+        await database.daily_loads.delete_many({"userId": user_id, "sessions": {"$lte": 0}})
+
+async def last_write_at(user_id: str) -> Optional[datetime]:
+    meta = await db.get_db().workout_meta.find_one({"userId": user_id}, projection={"lastWriteAt": 1})
+    return meta.get("lastWriteAt") if meta else None
+
+async def series_etag(user_id: str, *parts: Any) -> str:
+    """ETag for data derived from the user's rollups.
+
+    Only a workout write changes it, so a matching If-None-Match (see
+    ``etag_matches``) can be answered 304 without reading any rollups.
+    """
+    last_write = await last_write_at(user_id)
+    tag = "|".join([user_id, last_write.isoformat() if last_write else "", *map(str, parts)])
+    return f'"{hashlib.sha1(tag.encode()).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check: ``*`` or any listed tag, compared weakly (``W/`` ignored)."""
+    header = request.headers.get("if-none-match", "").strip()
+    if header == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+async def daily_series(user_id: str, start: date, end: date) -> Dict[str, List[float]]:
+    """Dense per-day session counts and loads from ``start`` to ``end``."""
+    days = (end - start).days + 1
+    sessions = [0] * days
+    loads = [0] * days
+    cursor = db.get_db().daily_loads.find(
+        {"userId": user_id, "date": {"$gte": start.isoformat(), "$lte": end.isoformat()}},
+        projection={"_id": 0, "date": 1, "sessions": 1, "load": 1},
+    )
+    async for d in cursor:
+        i = (date.fromisoformat(d["date"]) - start).days
+        sessions[i] = d["sessions"]
+        loads[i] = d["load"]
+    return {"sessions": sessions, "load": loads}
+
+async def get_burnout(user_id: str) -> Dict[str, Any]:
+    database = db.get_db()
+
+    meta = await database.workout_meta.find_one({"userId": user_id})
+    if not meta or meta.get("sessions", 0) < 5:
+        return {"risk": "Unknown", "reason": "Not enough data"}
+
+    first = await database.daily_loads.find_one({"userId": user_id}, sort=[("date", 1)])
+    cursor = database.daily_loads.find({"userId": user_id}).sort("date", -1).limit(CHRONIC_WINDOW)
+    recent = await cursor.to_list(length=CHRONIC_WINDOW)
+    if not first or not recent:
+        return {"risk": "Unknown", "reason": "Not enough data"}
+
+    daily = {d["date"]: d["load"] for d in recent}
+    return burnout_from_daily_loads(daily, first["date"], recent[0]["date"])
+
+async def rebuild(user_id: Optional[str] = None) -> int:
+    """Recompute rollups from the workouts collection.
+
+    Rebuilds every user unless ``user_id`` is given. Returns the number of
+    daily rollup documents written.
+    """
+    database = db.get_db()
+    scope = {"userId": user_id} if user_id is not None else {}
+
+    await database.daily_loads.delete_many(scope)
+    await database.workout_meta.delete_many(scope)
+
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": scope},
+        {"$group": {
+            "_id": {"userId": "$userId", "date": {"$substrCP": ["$date", 0, 10]}},
+            "load": {"$sum": {"$multiply": ["$duration", "$intensity"]}},
+            "sessions": {"$sum": 1},
+        }},
+    ]
+
+    written = 0
+    batch: List[Dict[str, Any]] = []
+    sessions: Dict[Any, int] = defaultdict(int)
+    async for row in database.workouts.aggregate(pipeline, allowDiskUse=True):
+        batch.append({
+            "userId": row["_id"]["userId"],
+            "date": row["_id"]["date"],
+            "load": row["load"],
+            "sessions": row["sessions"],
+        })
+        sessions[row["_id"]["userId"]] += row["sessions"]
+        if len(batch) >= 1000:
+            await database.daily_loads.insert_many(batch, ordered=False)
+            written += len(batch)
+            batch = []
+
+    if batch:
+        await database.daily_loads.insert_many(batch, ordered=False)
+        written += len(batch)
+
+    if sessions:
+        now = datetime.now(timezone.utc)
+        await database.workout_meta.insert_many(
+            [{"userId": uid, "sessions": count, "lastWriteAt": now} for uid, count in sessions.items()],
+            ordered=False,
+        )
+
+    return written
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Literal
-from datetime import datetime
+import re
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import List, Optional, Literal
+from datetime import date, datetime
 from app.models.common import PyObjectId
 
 DisciplineType = Literal[
@@ -9,6 +10,9 @@ DisciplineType = Literal[
     'Sprints'
 ]
 
+# A day, optionally followed by a time
+ISO_DAY = re.compile(r"\d{4}-\d{2}-\d{2}(T|$)")
+
 class WorkoutBase(BaseModel):
     discipline: DisciplineType
     duration: int = Field(ge=1)
@@ -17,10 +21,22 @@ class WorkoutBase(BaseModel):
     date: str # YYYY-MM-DD
 
 class WorkoutCreate(WorkoutBase):
-    pass
+    @field_validator("date")
+    @classmethod
+    def check_date(cls, value: str) -> str:
+        # Rollups and weekly stats key on the day, so it must parse before
+        # anything is written. Stored documents are read back unchecked.
+        try:
+            if not ISO_DAY.match(value):
+                raise ValueError
+            date.fromisoformat(value[:10])
+        except ValueError:
+            raise ValueError("Expected an ISO date (YYYY-MM-DD)")
+        return value
 
 class WorkoutInDB(WorkoutBase):
-    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    # Read from Mongo's "_id", always sent (and documented) as "id"
+    id: Optional[PyObjectId] = Field(validation_alias="_id", default=None)
     userId: PyObjectId
     createdAt: datetime
     updatedAt: datetime
@@ -32,3 +48,8 @@ class WorkoutInDB(WorkoutBase):
 
 class WorkoutResponse(WorkoutInDB):
     pass
+
+class WorkoutListResponse(BaseModel):
+    # Validated and serialized to JSON bytes in one pydantic-core pass
+    workouts: List[WorkoutResponse]
+    nextCursor: Optional[str] = None
@@ -0,0 +1,41 @@
+import cProfile
+import os
+import pstats
+import re
+import secrets
+import time
+from typing import Any, Callable, Tuple, Union
+from fastapi import Request
+from app.config import settings
+from app.ml.executor import _resolve
+
+# Opt-in profiling of a single request. Only requests carrying the admin
+# profile token pay for the profiler; everything else does one header lookup.
+
+PROFILE_HEADER = "X-Profile"
+
+def profiling_requested(request: Request) -> bool:
+    token = settings.profile_token
+    if not token:
+        return False
+    supplied = request.headers.get(PROFILE_HEADER) or request.query_params.get("profile")
+    return bool(supplied) and secrets.compare_digest(supplied.encode(), token.encode())
+
+def save_profile(profiler: cProfile.Profile, label: str) -> str:
+    """Write ``<label>.prof`` plus a top-functions ``.txt`` summary; returns the .prof path."""
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{re.sub(r'[^A-Za-z0-9_.-]', '_', label)}"
+    base = os.path.join(settings.profile_dir, name)
+    profiler.dump_stats(base + ".prof")
+    with open(base + ".txt", "w") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(settings.profile_top_functions)
+        stats.sort_stats("tottime").print_stats(settings.profile_top_functions)
+    return base + ".prof"
+
+def profile_call(fn: Union[Callable, str], args: tuple, label: str) -> Tuple[Any, str]:
+    # Submitted to the ML executor so the profile covers the worker where the
+    # pandas/KMeans work actually runs
+    profiler = cProfile.Profile()
+    result = profiler.runcall(_resolve(fn), *args)
+    return result, save_profile(profiler, label)
@@ -0,0 +1,129 @@
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from app.config import settings
+from app.metrics import registry
+from app.models.user import UserInDB
+from app.routes.deps import get_current_user
+
+RATE_LIMITED = registry.counter(
+    "rate_limited_total", "Requests rejected by the rate limiter", ["route"]
+)
+
+class TokenBucketLimiter:
+    """Token buckets per client key, refilled at ``rate`` tokens a second up to ``burst``.
+
+    Buckets idle long enough to have refilled are indistinguishable from new
+    ones, so they are dropped; ``max_keys`` bounds memory under key churn by
+    evicting the least recently used bucket.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.idle_seconds = burst / rate
+        # key -> (tokens, last update); least recently used first
+        self.buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def _evict(self, now: float):
+        while self.buckets:
+            key, (_, updated) = next(iter(self.buckets.items()))
+            if len(self.buckets) <= self.max_keys and now - updated < self.idle_seconds:
+                break
+            del self.buckets[key]
+            self.evicted += 1
+
+    def acquire(self, key: str, cost: float, now: Optional[float] = None) -> float:
+        """Take ``cost`` tokens; returns 0 if allowed, else seconds until it would be."""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self.buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= cost:
+            tokens -= cost
+            retry_after = 0.0
+            self.allowed += 1
+        else:
+            retry_after = (cost - tokens) / self.rate
+            self.limited += 1
+        self.buckets[key] = (tokens, now)
+        self._evict(now)
+        return retry_after
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "keys": len(self.buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
+
+rate_limiter = TokenBucketLimiter(
+    rate=settings.rate_limit_refill_per_second,
+    burst=settings.rate_limit_burst,
+    max_keys=settings.rate_limit_max_keys,
+)
+
+@registry.collector
+def _limiter_samples():
+    return [("rate_limit_buckets", "gauge", "Clients tracked by the rate limiter", [
+        ({}, len(rate_limiter.buckets)),
+    ])]
+
+def _check(name: str, key: str):
+    if not settings.rate_limit_enabled:
+        return
+    retry_after = rate_limiter.acquire(key, settings.rate_limit_costs.get(name, 1))
+    if retry_after:
+        RATE_LIMITED.inc(route=name)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+@lru_cache(maxsize=8)
+def _networks(proxies: Tuple[str, ...]):
+    return [ipaddress.ip_network(p, strict=False) for p in proxies]
+
+def _is_trusted(host: str) -> bool:
+    networks = _networks(tuple(settings.rate_limit_trusted_proxies))
+    if not networks:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+def client_ip(request: Request) -> str:
+    """The peer address, or behind trusted proxies the nearest untrusted X-Forwarded-For hop."""
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted(host):
+        # Anyone can send X-Forwarded-For; only a trusted proxy's is believed
+        return host
+    hops = [h.strip() for h in ",".join(request.headers.getlist("x-forwarded-for")).split(",") if h.strip()]
+    # Each proxy appends the peer it saw, so walk back from the nearest one
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else host
+
+def limit_by_ip(name: str):
+    """Dependency charging ``settings.rate_limit_costs[name]`` to the client address."""
+    async def dependency(request: Request):
+        _check(name, f"ip:{client_ip(request)}")
+    return dependency
+
+def limit_by_user(name: str):
+    """Dependency charging ``settings.rate_limit_costs[name]`` to the authenticated user."""
+    async def dependency(current_user: UserInDB = Depends(get_current_user)):
+        _check(name, f"user:{current_user.id}")
+    return dependency
@@ -2,8 +2,9 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
 from app.database import db
 from app.models.user import UserCreate, UserResponse, UserInDB
-from app.auth.security import get_password_hash, verify_password, create_access_token
-from app.routes.deps import get_current_user
+from app.auth.security import password_hasher, password_needs_rehash, create_access_token
+from app.routes.deps import get_current_user, invalidate_user
+from app.rate_limit import limit_by_ip
 from datetime import timedelta
 from app.config import settings
 
@@ -13,7 +14,17 @@ class LoginRequest(BaseModel):
 
 router = APIRouter()
 
-@router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
+def token_claims(user: dict) -> dict:
+    # username/email let get_current_user skip the users lookup when
+    # settings.trust_token_claims is enabled
+    return {"sub": str(user["_id"]), "username": user["username"], "email": user["email"]}
+
+@router.post(
+    "/register",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_by_ip("register"))],
+)
 async def register(user_in: UserCreate):
     # Check if user exists
     existing_user = await db.get_db().users.find_one({
@@ -29,7 +40,7 @@ async def register(user_in: UserCreate):
     # Create user
     user_dict = user_in.model_dump()
     password = user_dict.pop("password")
-    user_dict["passwordHash"] = get_password_hash(password)
+    user_dict["passwordHash"] = await password_hasher.hash(password)
     
     result = await db.get_db().users.insert_one(user_dict)
     
@@ -41,7 +52,7 @@ async def register(user_in: UserCreate):
 
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": str(created_user["_id"])}, expires_delta=access_token_expires
+        data=token_claims(created_user), expires_delta=access_token_expires
     )
     
     return {
@@ -51,19 +62,27 @@ async def register(user_in: UserCreate):
         "user": user_model.model_dump()
     }
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(limit_by_ip("login"))])
 async def login(login_data: LoginRequest):
     user = await db.get_db().users.find_one({"email": login_data.email})
-    if not user or not verify_password(login_data.password, user["passwordHash"]):
+    if not user or not await password_hasher.verify(login_data.password, user["passwordHash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if password_needs_rehash(user["passwordHash"]):
+        # bcrypt cost changed since this hash was made
+        new_hash = await password_hasher.hash(login_data.password)
+        await db.get_db().users.update_one(
+            {"_id": user["_id"]}, {"$set": {"passwordHash": new_hash}}
+        )
+        invalidate_user(user["_id"])
     
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": str(user["_id"])}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
     
     user_model = UserResponse(**user)
@@ -78,3 +97,7 @@ async def login(login_data: LoginRequest):
 @router.get("/me", response_model=dict)
 async def read_users_me(current_user: UserInDB = Depends(get_current_user)):
     return {"user": UserResponse(**current_user.model_dump()).model_dump()}
+
+@router.get("/hash/stats")
+async def get_hash_stats(current_user: UserInDB = Depends(get_current_user)):
+    return {"passwordHashing": password_hasher.stats()}
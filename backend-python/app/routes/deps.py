@@ -1,7 +1,10 @@
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+import time
+from datetime import date, timedelta
+from typing import Annotated, Optional, Tuple
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from app.cache import TTLCache
 from app.config import settings
 from app.database import db
 from app.models.user import UserInDB
@@ -9,6 +12,25 @@ from bson import ObjectId
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# token -> decoded claims, never kept past the token's expiry
+token_cache = TTLCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
+# user id -> UserInDB
+user_cache = TTLCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
+
+def invalidate_user(user_id):
+    # Call whenever a user record changes
+    user_cache.pop(str(user_id))
+
+def _decode_token(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        if "exp" in payload:
+            token_cache.set(token, payload, ttl=payload["exp"] - time.time())
+        else:
+            token_cache.set(token, payload)
+    return payload
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -16,15 +38,48 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = _decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+
+    if settings.trust_token_claims and "username" in payload and "email" in payload:
+        # Claims were signed by us at login; valid for the token's lifetime
+        return UserInDB(
+            _id=user_id,
+            username=payload["username"],
+            email=payload["email"],
+            passwordHash="",
+        )
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
     
     user = await db.get_db().users.find_one({"_id": ObjectId(user_id)})
     if user is None:
         raise credentials_exception
     
-    return UserInDB(**user)
+    user_model = UserInDB(**user)
+    user_cache.set(user_id, user_model)
+    return user_model
+
+def parse_day(value: str) -> date:
+    # The Query pattern only checks the shape; "2024-02-30" still gets here
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+
+def day_range(
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+) -> Tuple[date, date]:
+    # Inclusive day range for per-day series; defaults to the last year, capped at ~10
+    end_day = parse_day(end) if end else date.today()
+    start_day = parse_day(start) if start else end_day - timedelta(days=364)
+    if start_day > end_day or (end_day - start_day).days > 3660:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    return start_day, end_day
@@ -1,24 +1,112 @@
-from fastapi import APIRouter, Depends
-from app.database import db
-from app.routes.deps import get_current_user
+import asyncio
+import os
+from datetime import date, timedelta
+from typing import Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from app.config import settings
+from app.routes.deps import day_range, get_current_user
 from app.models.user import UserInDB
-from app.ml.engine import MLEngine
+from app.ml import precompute, rollups
+from app.ml.cache import insights_cache
+from app.ml.precompute import insights_precompute
+from app.ml.load import ACWR_WARMUP_DAYS
+from app.ml.executor import ml_executor, QueueFullError
+from app.rate_limit import limit_by_user
+from app.profiling import PROFILE_HEADER, profiling_requested
 
 router = APIRouter()
 
-@router.get("/insights")
-async def get_insights(current_user: UserInDB = Depends(get_current_user)):
-    # Fetch all user workouts
-    cursor = db.get_db().workouts.find({"userId": current_user.id})
-    workouts = await cursor.to_list(length=1000) # Analyze last 1000 sessions
-    
-    # Clean data for engine
-    workout_data = [{**w, "_id": str(w["_id"]), "userId": str(w["userId"])} for w in workouts]
-    
-    engine = MLEngine(workout_data)
-    
+async def _run_ml(fn: str, *args):
+    try:
+        return await ml_executor.run(fn, *args)
+    except QueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics are busy right now, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Analysis took too long to compute",
+        )
+
+def _acwr_series(load, skip):
+    # Imported on first use so the web process starts without NumPy
+    from app.ml.acwr import acwr_series
+    return acwr_series(load, skip)
+
+@router.get("/insights", dependencies=[Depends(limit_by_user("insights"))])
+async def get_insights(
+    request: Request,
+    response: Response,
+    current_user: UserInDB = Depends(get_current_user),
+):
+    # Profiled requests always recompute so the capture reflects real work
+    profile = profiling_requested(request)
+
+    cached = None if profile else insights_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+
+    if not profile:
+        stored = await precompute.load_stored(current_user.id)
+        if stored is not None and not stored["stale"]:
+            insights_cache.set(current_user.id, stored)
+            return stored
+        if stored is not None and settings.insights_precompute:
+            # Serve the last result now; the worker brings it up to date
+            insights_precompute.mark_dirty(current_user.id, immediate=True)
+            return stored
+
+    # Nothing stored yet (or profiling): compute on the request path.
+    # KMeans/pandas work runs in the ML pool so it cannot stall the event loop
+    async def run(feed):
+        if not profile:
+            return await _run_ml("app.ml.engine:compute_insights", feed)
+        analysis, profile_path = await _run_ml(
+            "app.profiling:profile_call",
+            "app.ml.engine:compute_insights",
+            (feed,),
+            f"insights-{current_user.id}",
+        )
+        response.headers[PROFILE_HEADER] = os.path.basename(profile_path)
+        return analysis
+
+    return await precompute.compute_and_store(current_user.id, run)
+
+@router.get("/acwr", dependencies=[Depends(limit_by_user("acwr"))])
+async def get_acwr(
+    request: Request,
+    response: Response,
+    days: Tuple[date, date] = Depends(day_range),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    start_day, end_day = days
+    etag = await rollups.series_etag(current_user.id, "acwr", start_day, end_day)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if rollups.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Earlier days only warm up the rolling and EWMA windows
+    warmup_start = start_day - timedelta(days=ACWR_WARMUP_DAYS)
+    daily = await rollups.daily_series(current_user.id, warmup_start, end_day)
+    # O(n) NumPy, about a millisecond: a thread, not the bounded ML pool
+    # that the KMeans jobs queue on
+    series = await run_in_threadpool(_acwr_series, daily["load"], ACWR_WARMUP_DAYS)
+    response.headers.update(headers)
     return {
-        "weaknesses": engine.analyze_weaknesses(),
-        "burnout": engine.predict_burnout(),
-        "focus": engine.get_recommended_focus()
+        "start": start_day.isoformat(),
+        "end": end_day.isoformat(),
+        # One entry per day from start to end in every series
+        **series,
     }
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: UserInDB = Depends(get_current_user)):
+    return {"insights": insights_cache.stats()}
+
+@router.get("/executor/stats")
+async def get_executor_stats(current_user: UserInDB = Depends(get_current_user)):
+    return {"executor": ml_executor.stats(), "precompute": insights_precompute.stats()}
@@ -1,28 +1,81 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
-from typing import List, Optional
+import base64
+import json
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Tuple
+from app.config import settings
 from app.database import db
-from app.models.workout import WorkoutCreate, WorkoutResponse, WorkoutInDB
+from app.models.workout import WorkoutCreate, WorkoutResponse, WorkoutInDB, WorkoutListResponse
 from app.models.user import UserInDB
-from app.routes.deps import get_current_user
-from datetime import datetime, timezone
+from app.routes.deps import day_range, get_current_user, parse_day
+from app.ml import rollups
+from app.ml.cache import insights_cache
+from app.ml.precompute import insights_precompute
+from app import workout_io, weekly_stats
+from app.workout_storage import storage_fields, time_field, time_key
+from datetime import date, datetime, timezone
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 
 router = APIRouter()
 
-@router.get("/", response_model=dict)
+async def _on_workouts_changed(user_id, removed=(), added=()):
+    # Keep derived per-user data in step with the workouts collection
+    await rollups.apply_workout_changes(user_id, removed=removed, added=added)
+    await weekly_stats.apply_workout_changes(user_id, removed=removed, added=added)
+    insights_cache.bump(user_id)
+    if settings.insights_precompute:
+        insights_precompute.mark_dirty(user_id)
+
+def encode_cursor(workout: dict) -> str:
+    # Opaque keyset position: (date, createdAt, _id) of the last row served
+    key = [workout["date"], workout["createdAt"].isoformat(), str(workout["_id"])]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(token: str) -> dict:
+    """Query matching workouts strictly after the cursor in listing order."""
+    try:
+        date, created_at, oid = json.loads(base64.urlsafe_b64decode(token.encode()))
+        created_at = datetime.fromisoformat(created_at)
+        oid = ObjectId(oid)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    field, key = time_field(), time_key(date)
+    return {
+        # Top-level bound keeps this an index range scan on (userId, date),
+        # or skips whole buckets by ts in the time-series layout
+        field: {"$lte": key},
+        "$or": [
+            {field: {"$lt": key}},
+            {field: key, "createdAt": {"$lt": created_at}},
+            {field: key, "createdAt": created_at, "_id": {"$lt": oid}},
+        ],
+    }
+
+@router.get("/", response_model=WorkoutListResponse)
 async def get_workouts(
     limit: int = 100,
     skip: int = 0,
+    after: Optional[str] = None,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    cursor = db.get_db().workouts.find({"userId": current_user.id})
-    cursor.sort([("date", -1), ("createdAt", -1)]).skip(skip).limit(limit)
+    query = {"userId": current_user.id}
+    if after:
+        query.update(decode_cursor(after))
+
+    cursor = db.get_db().workouts.find(query)
+    cursor.sort([(time_field(), -1), ("createdAt", -1), ("_id", -1)]).skip(skip).limit(limit)
     
     workouts = await cursor.to_list(length=limit)
     
-    return {
-        "workouts": [WorkoutResponse(**w).model_dump() for w in workouts]
-    }
+    page = WorkoutListResponse(
+        workouts=workouts,
+        # Pass as ?after= to fetch the next page; None on the last page
+        nextCursor=encode_cursor(workouts[-1]) if workouts and len(workouts) == limit else None
+    )
+    # Raw JSON bytes: skips FastAPI's second validate/encode pass over every row
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_workout(
@@ -34,16 +87,124 @@ async def create_workout(
     now = datetime.now(timezone.utc)
     workout_dict["createdAt"] = now
     workout_dict["updatedAt"] = now
+    workout_dict.update(storage_fields(workout_dict))
     
     result = await db.get_db().workouts.insert_one(workout_dict)
     
     created_workout = await db.get_db().workouts.find_one({"_id": result.inserted_id})
+    await _on_workouts_changed(current_user.id, added=[created_workout])
     
     return {
         "message": "Workout created successfully",
         "workout": WorkoutResponse(**created_workout).model_dump()
     }
 
+@router.post("/import", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def import_workouts(
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    # Body is read as a stream, so memory stays flat however large the upload
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    lines = workout_io.iter_lines(request.stream(), settings.import_max_line_bytes)
+    if format == "csv":
+        rows = workout_io.iter_csv(lines, settings.import_max_line_bytes)
+    else:
+        rows = workout_io.iter_ndjson(lines)
+
+    imported = 0
+    errors = []
+    error_count = 0
+    batch = []
+    batch_rows = []
+
+    def record_error(row, message):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < settings.import_max_errors:
+            errors.append({"row": row, "error": message})
+
+    async def flush():
+        nonlocal imported, batch, batch_rows
+        now = datetime.now(timezone.utc)
+        for doc in batch:
+            doc["createdAt"] = now
+            doc["updatedAt"] = now
+            doc.update(storage_fields(doc))
+        inserted = batch
+        try:
+            await db.get_db().workouts.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: everything but the failed indexes was written, and
+            # must still reach the rollups
+            failed = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+            inserted = [doc for i, doc in enumerate(batch) if i not in failed]
+            for i, message in sorted(failed.items()):
+                record_error(batch_rows[i], message)
+        if inserted:
+            await _on_workouts_changed(current_user.id, added=inserted)
+        imported += len(inserted)
+        batch = []
+        batch_rows = []
+
+    async for row, data in rows:
+        try:
+            workout_in = workout_io.validate_row(data)
+        except Exception as e:
+            record_error(row, workout_io.describe_error(e))
+            continue
+        batch.append({**workout_in.model_dump(), "userId": current_user.id})
+        batch_rows.append(row)
+        if len(batch) >= settings.import_batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return {
+        "message": f"Imported {imported} workouts",
+        "imported": imported,
+        "failed": error_count,
+        # Capped at settings.import_max_errors
+        "errors": errors
+    }
+
+@router.get("/export")
+async def export_workouts(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: UserInDB = Depends(get_current_user)
+):
+    # Streams straight from the cursor, one batch in memory at a time
+    projection = {f: 1 for f in workout_io.EXPORT_FIELDS if f != "id"}
+    cursor = db.get_db().workouts.find({"userId": current_user.id}, projection=projection)
+    cursor.sort([(time_field(), 1), ("createdAt", 1), ("_id", 1)]).batch_size(settings.export_batch_size)
+
+    def render(batch, first):
+        if format == "csv":
+            return workout_io.csv_chunk(batch, header=first)
+        return workout_io.ndjson_chunk(batch)
+
+    async def generate():
+        batch = []
+        first = True
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= settings.export_batch_size:
+                yield render(batch, first)
+                batch = []
+                first = False
+        if batch or first:
+            yield render(batch, first)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="workouts.{format}"'},
+    )
+
 @router.get("/stats/summary")
 async def get_stats(current_user: UserInDB = Depends(get_current_user)):
     pipeline = [
@@ -70,6 +231,45 @@ async def get_stats(current_user: UserInDB = Depends(get_current_user)):
         }
     }
 
+@router.get("/stats")
+async def get_grouped_stats(
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    groupBy: Literal["discipline", "week", "month"] = "week",
+    current_user: UserInDB = Depends(get_current_user)
+):
+    # Served from weekly summary documents, not a scan of every workout
+    for day in (start, end):
+        if day:
+            parse_day(day)
+    stats = await weekly_stats.get_stats(current_user.id, start=start, end=end, group_by=groupBy)
+    return {"stats": stats}
+
+@router.get("/heatmap")
+async def get_heatmap(
+    request: Request,
+    response: Response,
+    days: Tuple[date, date] = Depends(day_range),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    start_day, end_day = days
+
+    etag = await rollups.series_etag(current_user.id, start_day, end_day)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if rollups.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    series = await rollups.daily_series(current_user.id, start_day, end_day)
+    response.headers.update(headers)
+    return {
+        "start": start_day.isoformat(),
+        "end": end_day.isoformat(),
+        # One entry per day from start to end
+        "sessions": series["sessions"],
+        "load": series["load"]
+    }
+
 @router.put("/{id}", response_model=dict)
 async def update_workout(
     id: str,
@@ -78,15 +278,19 @@ async def update_workout(
 ):
     update_data = workout_in.model_dump(exclude_unset=True)
     update_data["updatedAt"] = datetime.now(timezone.utc)
+    update_data.update(storage_fields(update_data))
     
-    result = await db.get_db().workouts.find_one_and_update(
+    previous = await db.get_db().workouts.find_one_and_update(
         {"_id": ObjectId(id), "userId": current_user.id},
         {"$set": update_data},
-        return_document=True
+        return_document=ReturnDocument.BEFORE
     )
     
-    if not result:
+    if not previous:
         raise HTTPException(status_code=404, detail="Workout not found")
+
+    result = {**previous, **update_data}
+    await _on_workouts_changed(current_user.id, removed=[previous], added=[result])
         
     return {
         "message": "Workout updated successfully",
@@ -98,12 +302,14 @@ async def delete_workout(
     id: str,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    result = await db.get_db().workouts.delete_one(
+    deleted = await db.get_db().workouts.find_one_and_delete(
         {"_id": ObjectId(id), "userId": current_user.id}
     )
     
-    if result.deleted_count == 0:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Workout not found")
+
+    await _on_workouts_changed(current_user.id, removed=[deleted])
         
     return {"message": "Workout deleted successfully"}
 
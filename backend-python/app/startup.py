@@ -0,0 +1,13 @@
+import time
+
+# Imported first by app.main so the clock starts before the heavy imports
+_started = time.perf_counter()
+timings = {}
+
+def mark(stage: str):
+    # Milliseconds since app.main started importing; first mark wins
+    if stage not in timings:
+        timings[stage] = round((time.perf_counter() - _started) * 1000, 1)
+
+def report() -> dict:
+    return dict(timings)
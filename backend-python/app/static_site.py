@@ -0,0 +1,120 @@
+import gzip
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from starlette.responses import FileResponse, Response
+
+# The built frontend, indexed once at startup. Requests are answered from
+# the in-memory manifest: no filesystem lookups, a precompressed variant
+# picked by Accept-Encoding, and cache headers decided up front.
+
+# Vite content-hashes everything under assets/, so those never change
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Everything else (index.html, favicon, ...) is revalidated by ETag
+REVALIDATE = "no-cache"
+
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".webmanifest")
+# Preference order when the client accepts several
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Indexing runs while app.main is imported, so files the build did not
+# precompress get the fastest level; ship .gz/.br for the best ratio
+GZIP_LEVEL = 1
+
+@dataclass
+class Variant:
+    # Served from ``body`` when held in memory, otherwise streamed from ``path``
+    path: Optional[str] = None
+    stat: Optional[os.stat_result] = None
+    body: Optional[bytes] = None
+
+@dataclass
+class StaticFile:
+    media_type: str
+    etag: str
+    cache_control: str
+    variants: Dict[str, Variant] = field(default_factory=dict)
+
+def accepted_encodings(header: str) -> set:
+    # "br;q=1.0, gzip;q=0.8, identity;q=0" -> {"br", "gzip"}
+    accepted = set()
+    for part in header.split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.lower())
+    return accepted
+
+class StaticSite:
+    def __init__(self, root: str, gzip_max_bytes: int):
+        self.root = root
+        self.gzip_max_bytes = gzip_max_bytes
+        self.files: Dict[str, StaticFile] = {}
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                if name.endswith((".gz", ".br")):
+                    continue
+                path = os.path.join(dirpath, name)
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                self.files[rel] = self._index(rel, path)
+
+    def _index(self, rel: str, path: str) -> StaticFile:
+        stat = os.stat(path)
+        entry = StaticFile(
+            media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+            etag=f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            cache_control=IMMUTABLE if rel.startswith("assets/") else REVALIDATE,
+            variants={"identity": Variant(path, stat)},
+        )
+        if rel == "index.html":
+            # Every client-side route falls back to it
+            with open(path, "rb") as f:
+                entry.variants["identity"] = Variant(body=f.read())
+
+        if rel.endswith(COMPRESSIBLE):
+            # Variants shipped by the frontend build win
+            for encoding, suffix in ENCODINGS:
+                if os.path.isfile(path + suffix):
+                    entry.variants[encoding] = Variant(path + suffix, os.stat(path + suffix))
+            if "gzip" not in entry.variants and stat.st_size <= self.gzip_max_bytes:
+                with open(path, "rb") as f:
+                    entry.variants["gzip"] = Variant(body=gzip.compress(f.read(), GZIP_LEVEL, mtime=0))
+        return entry
+
+    def stats(self):
+        variants = [e for f in self.files.values() for e in f.variants if e != "identity"]
+        return {"files": len(self.files), "br": variants.count("br"), "gzip": variants.count("gzip")}
+
+    def response(self, path: str, accept_encoding: str = "", if_none_match: str = "") -> Response:
+        entry = self.files.get(path)
+        if entry is None:
+            if path.startswith("assets/") or "index.html" not in self.files:
+                return Response(status_code=404)
+            # Client-side route: let React Router handle it
+            entry = self.files["index.html"]
+
+        encoding = "identity"
+        if len(entry.variants) > 1:
+            accepted = accepted_encodings(accept_encoding)
+            encoding = next((e for e, _ in ENCODINGS if e in accepted and e in entry.variants), "identity")
+
+        etag = f'"{entry.etag}"' if encoding == "identity" else f'"{entry.etag}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": entry.cache_control}
+        if len(entry.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if etag in [t.strip() for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        variant = entry.variants[encoding]
+        if variant.body is not None:
+            return Response(variant.body, media_type=entry.media_type, headers=headers)
+        return FileResponse(variant.path, stat_result=variant.stat, media_type=entry.media_type, headers=headers)
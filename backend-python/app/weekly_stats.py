@@ -0,0 +1,164 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from pymongo import UpdateOne
+from app.database import db
+from app.ml.load import workout_day, workout_load
+
+# Per-user weekly summary documents, maintained on the write path:
+#
+#   {userId, week: "2024-W05", weekStart: "2024-01-29",
+#    days: {"2024-01-30": {"Boxing": {sessions, duration, intensity, load}}}}
+#
+# A year of stats is ~52 small documents however many sessions it holds.
+# Keeping per-day detail inside each week makes date ranges and month
+# grouping exact.
+
+METRICS = ("sessions", "duration", "intensity", "load")
+
+def week_of(day: str) -> Dict[str, str]:
+    d = date.fromisoformat(day[:10])
+    year, week, weekday = d.isocalendar()
+    return {"week": f"{year}-W{week:02d}", "weekStart": (d - timedelta(days=weekday - 1)).isoformat()}
+
+def _deltas(
+    removed: Iterable[Mapping[str, Any]],
+    added: Iterable[Mapping[str, Any]],
+) -> Dict[str, Dict[str, float]]:
+    # "days.<day>.<discipline>.<metric>" -> increment, grouped by weekStart
+    weeks: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+    for sign, workouts in ((-1, removed), (1, added)):
+        for w in workouts:
+            day = workout_day(w)
+            inc = weeks[week_of(day)["weekStart"]]
+            prefix = f"days.{day}.{w['discipline']}"
+            inc[f"{prefix}.sessions"] += sign
+            inc[f"{prefix}.duration"] += sign * w["duration"]
+            inc[f"{prefix}.intensity"] += sign * w["intensity"]
+            inc[f"{prefix}.load"] += sign * workout_load(w)
+    return {
+        start: {k: v for k, v in inc.items() if v}
+        for start, inc in weeks.items()
+        if any(inc.values())
+    }
+
+async def apply_workout_changes(
+    user_id: str,
+    removed: Iterable[Mapping[str, Any]] = (),
+    added: Iterable[Mapping[str, Any]] = (),
+):
+    deltas = _deltas(removed, added)
+    if not deltas:
+        return
+    await db.get_db().weekly_stats.bulk_write([
+        UpdateOne(
+            {"userId": user_id, "weekStart": start},
+            {"$inc": inc, "$setOnInsert": {"week": week_of(start)["week"]}},
+            upsert=True,
+        )
+        for start, inc in deltas.items()
+    ], ordered=False)
+
+def _group_key(group_by: str, day: str, discipline: str) -> str:
+    if group_by == "discipline":
+        return discipline
+    if group_by == "month":
+        return day[:7]
+    return week_of(day)["week"]
+
+def _summary(totals: Mapping[str, float]) -> Dict[str, Any]:
+    sessions = totals.get("sessions", 0)
+    return {
+        "sessions": int(sessions),
+        "totalDuration": totals.get("duration", 0),
+        "totalLoad": totals.get("load", 0),
+        "avgIntensity": round(totals.get("intensity", 0) / sessions, 1) if sessions else 0,
+    }
+
+def summarize(
+    weeks: Iterable[Mapping[str, Any]],
+    start: Optional[str],
+    end: Optional[str],
+    group_by: str,
+) -> Dict[str, Any]:
+    totals: Dict[str, float] = defaultdict(int)
+    groups: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+    for week in weeks:
+        for day, disciplines in week.get("days", {}).items():
+            if (start and day < start) or (end and day > end):
+                continue
+            for discipline, metrics in disciplines.items():
+                if metrics.get("sessions", 0) <= 0:
+                    continue
+                group = groups[_group_key(group_by, day, discipline)]
+                for m in METRICS:
+                    group[m] += metrics.get(m, 0)
+                    totals[m] += metrics.get(m, 0)
+    return {
+        "totals": _summary(totals),
+        "groups": [{"key": key, **_summary(groups[key])} for key in sorted(groups)],
+    }
+
+async def get_stats(
+    user_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    group_by: str = "week",
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"userId": user_id}
+    bounds: Dict[str, str] = {}
+    if start:
+        bounds["$gte"] = week_of(start)["weekStart"]
+    if end:
+        bounds["$lte"] = end
+    if bounds:
+        query["weekStart"] = bounds
+    weeks = await db.get_db().weekly_stats.find(query, projection={"days": 1}).to_list(length=None)
+    return summarize(weeks, start, end, group_by)
+
+async def rebuild(user_id: Optional[str] = None) -> int:
+    """Recompute weekly summaries from the workouts collection."""
+    database = db.get_db()
+    scope = {"userId": user_id} if user_id is not None else {}
+    await database.weekly_stats.delete_many(scope)
+
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": scope},
+        {"$group": {
+            "_id": {
+                "userId": "$userId",
+                "date": {"$substrCP": ["$date", 0, 10]},
+                "discipline": "$discipline",
+            },
+            "sessions": {"$sum": 1},
+            "duration": {"$sum": "$duration"},
+            "intensity": {"$sum": "$intensity"},
+            "load": {"$sum": {"$multiply": ["$duration", "$intensity"]}},
+        }},
+        # Each user's weeks arrive one after another, so only the week being
+        # filled is held in memory
+        {"$sort": {"_id.userId": 1, "_id.date": 1}},
+    ]
+
+    written = 0
+    batch: List[Dict[str, Any]] = []
+    doc: Optional[Dict[str, Any]] = None
+    async for row in database.workouts.aggregate(pipeline, allowDiskUse=True):
+        key = row["_id"]
+        week = week_of(key["date"])
+        if doc is None or (doc["userId"], doc["weekStart"]) != (key["userId"], week["weekStart"]):
+            if doc is not None:
+                batch.append(doc)
+            doc = {"userId": key["userId"], **week, "days": {}}
+            if len(batch) >= 1000:
+                await database.weekly_stats.insert_many(batch, ordered=False)
+                written += len(batch)
+                batch = []
+        doc["days"].setdefault(key["date"], {})[key["discipline"]] = {m: row[m] for m in METRICS}
+
+    if doc is not None:
+        batch.append(doc)
+    if batch:
+        await database.weekly_stats.insert_many(batch, ordered=False)
+        written += len(batch)
+    return written
@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, List, Mapping, Tuple
+from pydantic import ValidationError
+from app.models.workout import WorkoutCreate
+
+# Streaming NDJSON/CSV parsing for bulk workout import, and the matching
+# writers for export.
+
+EXPORT_FIELDS = ["id", "date", "discipline", "duration", "intensity", "notes", "createdAt", "updatedAt"]
+
+def _decode(line: bytes) -> Any:
+    try:
+        return line.decode("utf-8-sig").rstrip("\r")
+    except UnicodeDecodeError as e:
+        return ValueError(f"Invalid UTF-8 at byte {e.start}")
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[Any]:
+    # A line longer than ``max_bytes``, or not valid UTF-8, is yielded as an
+    # error instead; the buffer never grows past ``max_bytes``
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                # Tail of the oversized line
+                skipping = False
+            elif len(line) > max_bytes:
+                yield ValueError(f"Line exceeds {max_bytes} bytes")
+            else:
+                yield _decode(line)
+        if len(buffer) > max_bytes:
+            if not skipping:
+                yield ValueError(f"Line exceeds {max_bytes} bytes")
+            skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield _decode(buffer)
+
+async def iter_ndjson(lines: AsyncIterator[Any]) -> AsyncIterator[Tuple[int, Any]]:
+    row = 0
+    async for line in lines:
+        row += 1
+        if isinstance(line, Exception):
+            yield row, line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield row, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, ValueError(f"Invalid JSON: {e.msg}")
+
+async def iter_csv(lines: AsyncIterator[Any], max_bytes: int) -> AsyncIterator[Tuple[int, Any]]:
+    header = None
+    row = 0
+    pending: List[str] = []
+    pending_size = 0
+    quotes = 0
+    async for line in lines:
+        if isinstance(line, Exception):
+            # Whatever record the oversized line belonged to is lost with it
+            pending, pending_size, quotes = [], 0, 0
+            row += 1
+            yield row, line
+            continue
+        pending.append(line)
+        pending_size += len(line) + 1
+        quotes += line.count('"')
+        # An odd number of quotes means a quoted field continues on the next line
+        if quotes % 2:
+            if pending_size > max_bytes:
+                # Most likely a stray quote; resume at the next line
+                pending, pending_size, quotes = [], 0, 0
+                row += 1
+                yield row, ValueError(f"Record exceeds {max_bytes} bytes (unbalanced quote?)")
+            continue
+        record = "\n".join(pending)
+        pending, pending_size, quotes = [], 0, 0
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield row, dict(zip(header, values))
+    if pending:
+        yield row + 1, ValueError("Unterminated quoted field")
+
+def validate_row(data: Any) -> WorkoutCreate:
+    if isinstance(data, Exception):
+        raise data
+    if not isinstance(data, dict):
+        raise ValueError("Expected an object")
+    return WorkoutCreate.model_validate(data)
+
+def describe_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def export_row(doc: Mapping[str, Any]) -> List[Any]:
+    return [_export_value(doc.get("_id" if f == "id" else f)) for f in EXPORT_FIELDS]
+
+def ndjson_chunk(docs: Iterable[Mapping[str, Any]]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, export_row(d))), default=str) + "\n" for d in docs
+    )
+
+def csv_chunk(docs: Iterable[Mapping[str, Any]], header: bool = False) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(export_row(d) for d in docs)
+    return out.getvalue()
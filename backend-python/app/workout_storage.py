@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping
+from app.config import settings
+
+# Storage layout of the workouts collection.
+#
+# "collection"  one plain document (and index entry) per session.
+# "timeseries"  a MongoDB time-series collection: timeField "ts", metaField
+#               "userId". MongoDB packs each user's sessions into compressed
+#               bucket documents spanning up to ~30 days ("hours"
+#               granularity), so per-user range reads and aggregations touch
+#               one bucket per month instead of one document per session.
+#
+# "date" is stored either way. In the time-series layout "ts" is written
+# alongside it, and range filters and listing order go through
+# time_field()/time_key() so MongoDB can skip whole buckets by time.
+# Updates and deletes by _id on a time-series collection need MongoDB 7.0+
+# (8.0 recommended).
+
+TIMESERIES_OPTIONS = {"timeField": "ts", "metaField": "userId", "granularity": "hours"}
+
+def timeseries_enabled() -> bool:
+    return settings.workout_storage == "timeseries"
+
+def session_time(day: str) -> datetime:
+    return datetime.fromisoformat(str(day)[:10]).replace(tzinfo=timezone.utc)
+
+def time_field() -> str:
+    """Field to filter and sort workouts by time on in the active layout."""
+    return "ts" if timeseries_enabled() else "date"
+
+def time_key(day: str) -> Any:
+    """Value of ``time_field()`` for a workout dated ``day``."""
+    return session_time(day) if timeseries_enabled() else day
+
+def storage_fields(workout: Mapping[str, Any]) -> Dict[str, Any]:
+    """Extra fields the active layout needs on a workout document."""
+    if timeseries_enabled() and "date" in workout:
+        return {"ts": session_time(workout["date"])}
+    return {}
+
+async def ensure_collection(database):
+    if not timeseries_enabled():
+        return
+    cursor = await database.list_collections(filter={"name": "workouts"})
+    info = await cursor.to_list(length=1)
+    if not info:
+        await database.create_collection("workouts", timeseries=TIMESERIES_OPTIONS)
+        print("Created time-series workouts collection")
+    elif info[0].get("type") != "timeseries":
+        print("WORKOUT_STORAGE=timeseries but workouts is a plain collection; "
+              "run migrate_workouts.py to convert it")
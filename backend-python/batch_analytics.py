@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import pandas as pd
+from pymongo import ReplaceOne
+from app.database import db
+from app.ml.batch import BATCH_FIELDS, cohort_report
+
+# Nightly burnout / weakness report for every athlete.
+#
+# Usage:
+#   python batch_analytics.py --out reports.csv
+#   python batch_analytics.py --out reports.parquet --workers 4
+#   python batch_analytics.py --collection insight_reports
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compute insights for all users")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="Write reports to a .csv or .parquet file")
+    target.add_argument("--collection", help="Upsert reports into this MongoDB collection")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-rows", type=int, default=200_000,
+                        help="Workout rows per unit of work sent to a worker")
+    return parser.parse_args()
+
+async def stream_chunks(chunk_rows: int):
+    # Sorted by userId so a user's workouts never straddle two chunks
+    cursor = db.get_db().workouts.find(
+        {}, projection={f: 1 for f in BATCH_FIELDS} | {"_id": 0}
+    ).sort("userId", 1).batch_size(10_000)
+
+    columns = defaultdict(list)
+    rows = 0
+    current_user = None
+    async for w in cursor:
+        if rows >= chunk_rows and w["userId"] != current_user:
+            yield dict(columns)
+            columns, rows = defaultdict(list), 0
+        current_user = w["userId"]
+        for f in BATCH_FIELDS:
+            columns[f].append(w.get(f))
+        rows += 1
+    if rows:
+        yield dict(columns)
+
+async def write_collection(name: str, report: pd.DataFrame):
+    generated_at = datetime.now(timezone.utc)
+    records = report.astype(object).where(report.notna(), None).to_dict("records")
+    ops = [
+        ReplaceOne({"userId": r["userId"]}, {**r, "generatedAt": generated_at}, upsert=True)
+        for r in records
+    ]
+    for i in range(0, len(ops), 1000):
+        await db.get_db()[name].bulk_write(ops[i:i + 1000], ordered=False)
+
+async def main():
+    args = parse_args()
+    started = time.perf_counter()
+    db.connect()
+    loop = asyncio.get_running_loop()
+    try:
+        parts = []
+        # spawn, as in app/ml/executor.py: forking under a live Motor client is unsafe
+        spawn = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=spawn) as pool:
+            # At most one chunk per worker in flight, so reading the cursor
+            # waits on the workers instead of buffering the whole collection
+            pending = set()
+            async for chunk in stream_chunks(args.chunk_rows):
+                if len(pending) >= args.workers:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    parts.extend(job.result() for job in done)
+                pending.add(loop.run_in_executor(pool, cohort_report, chunk))
+            parts.extend(await asyncio.gather(*pending))
+        parts = [part for part in parts if not part.empty]
+        report = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+        if args.collection:
+            await write_collection(args.collection, report)
+        elif args.out.endswith(".parquet"):
+            report.to_parquet(args.out, index=False) # needs pyarrow
+        else:
+            report.to_csv(args.out, index=False)
+    finally:
+        db.disconnect()
+
+    elapsed = time.perf_counter() - started
+    print(f"Processed {len(report)} users in {elapsed:.2f}s "
+          f"({len(report) / elapsed:.1f} users/s, {args.workers} workers)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
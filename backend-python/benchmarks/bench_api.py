@@ -0,0 +1,67 @@
+import json
+from typing import Dict, Iterable
+import httpx
+from app.config import settings
+from app.database import db
+from app.main import app
+from app.ml.cache import insights_cache
+from app.ml.executor import ml_executor
+from benchmarks import memory_db, synthetic
+from benchmarks.harness import measure_async
+
+# workouts/ml routes through an in-process ASGI client on the in-memory
+# database. Absolute numbers include the stand-in's own overhead; compare
+# runs against a baseline from the same machine.
+
+async def _user(client: httpx.AsyncClient, name: str, history: int) -> Dict[str, str]:
+    res = await client.post("/api/auth/register", json={
+        "username": name, "email": f"{name}@example.com", "password": "benchmark-password",
+    })
+    res.raise_for_status()
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    body = "\n".join(json.dumps(w) for w in synthetic.workouts(history, seed=history))
+    res = await client.post("/api/workouts/import?format=ndjson", content=body, headers=headers)
+    res.raise_for_status()
+    return headers
+
+async def run(sizes: Iterable[int], budget: float) -> Dict[str, float]:
+    memory_db.install()
+    # Measures the handlers, not the limiter's 429s
+    settings.rate_limit_enabled = False
+    # Threads avoid process start-up noise; the job itself is the same
+    ml_executor.kind = "thread"
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for n in sizes:
+            headers = await _user(client, f"bench{n}", n)
+            new_workout = synthetic.workouts(1, seed=1)[0]
+
+            async def call(method: str, url: str, **kwargs):
+                res = await client.request(method, url, headers=headers, **kwargs)
+                res.raise_for_status()
+
+            async def insights_cold():
+                insights_cache.entries.clear()
+                await db.get_db().insights.delete_many({})
+                await call("GET", "/api/ml/insights")
+
+            async def insights_stored():
+                # Precomputed result read back from the insights collection
+                insights_cache.entries.clear()
+                await call("GET", "/api/ml/insights")
+
+            cases = {
+                "list": lambda: call("GET", "/api/workouts/?limit=100"),
+                "create": lambda: call("POST", "/api/workouts/", json=new_workout),
+                "stats_summary": lambda: call("GET", "/api/workouts/stats/summary"),
+                "stats_weekly": lambda: call("GET", "/api/workouts/stats?groupBy=month"),
+                "insights_cold": insights_cold,
+                "insights_stored": insights_stored,
+                "insights_cached": lambda: call("GET", "/api/ml/insights"),
+            }
+            for name, fn in cases.items():
+                results[f"api.{name}[n={n}]"] = await measure_async(fn, budget)
+            print(f"  api n={n} done")
+    ml_executor.shutdown()
+    return results
@@ -0,0 +1,18 @@
+from typing import Dict, Iterable
+from app.ml.engine import MLEngine
+from benchmarks import synthetic
+from benchmarks.harness import measure
+
+# MLEngine stages over synthetic histories.
+
+def run(sizes: Iterable[int], budget: float) -> Dict[str, float]:
+    results = {}
+    for n in sizes:
+        workouts = synthetic.workouts(n, seed=n)
+        engine = MLEngine(workouts)
+        results[f"engine.init[n={n}]"] = measure(lambda: MLEngine(workouts), budget)
+        results[f"engine.analyze_weaknesses[n={n}]"] = measure(engine.analyze_weaknesses, budget)
+        results[f"engine.predict_burnout[n={n}]"] = measure(engine.predict_burnout, budget)
+        results[f"engine.get_recommended_focus[n={n}]"] = measure(engine.get_recommended_focus, budget)
+        print(f"  engine n={n} done")
+    return results
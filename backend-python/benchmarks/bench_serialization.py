@@ -0,0 +1,49 @@
+import json
+import timeit
+from datetime import datetime, timedelta
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from app.models.workout import WorkoutListResponse, WorkoutResponse
+
+# Per-row cost of serializing a GET /api/workouts/ page.
+#
+#   python -m benchmarks.bench_serialization
+
+def make_docs(n):
+    start = datetime(2024, 1, 1, 18, 30)
+    user_id = str(ObjectId())
+    return [{
+        "_id": ObjectId(),
+        "userId": user_id,
+        "discipline": "Muay Thai",
+        "duration": 60,
+        "intensity": 7,
+        "notes": "Pads, clinch and 3x3min sparring",
+        "date": (start - timedelta(days=i)).strftime("%Y-%m-%d"),
+        "createdAt": start - timedelta(days=i),
+        "updatedAt": start - timedelta(days=i),
+    } for i in range(n)]
+
+def legacy(docs):
+    # model_dump per row, then FastAPI's jsonable_encoder + json.dumps
+    body = {"workouts": [WorkoutResponse(**w).model_dump() for w in docs], "nextCursor": None}
+    return json.dumps(jsonable_encoder(body)).encode()
+
+def fast(docs):
+    return WorkoutListResponse(workouts=docs).model_dump_json().encode()
+
+def main():
+    print(f"{'rows':>6} {'legacy us/row':>14} {'fast us/row':>12} {'speedup':>8}")
+    for n in (100, 1000):
+        docs = make_docs(n)
+        assert json.loads(legacy(docs)) == json.loads(fast(docs))
+        number = max(1, 20000 // n)
+        results = {}
+        for name, fn in (("legacy", legacy), ("fast", fast)):
+            best = min(timeit.repeat(lambda: fn(docs), number=number, repeat=5))
+            results[name] = best / number / n * 1e6
+        print(f"{n:>6} {results['legacy']:>14.2f} {results['fast']:>12.2f} "
+              f"{results['legacy'] / results['fast']:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import statistics
+import time
+from typing import Awaitable, Callable, Dict
+
+def _repeats(first: float, budget: float, min_runs: int, max_runs: int) -> int:
+    return max(min_runs, min(max_runs, int(budget / max(first, 1e-9))))
+
+def measure(fn: Callable[[], object], budget: float = 0.5, min_runs: int = 3, max_runs: int = 200) -> float:
+    """Median wall time of ``fn`` in seconds, within roughly ``budget`` seconds."""
+    start = time.perf_counter()
+    fn()
+    samples = [time.perf_counter() - start]
+    for _ in range(_repeats(samples[0], budget, min_runs, max_runs) - 1):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+async def measure_async(fn: Callable[[], Awaitable[object]], budget: float = 0.5,
+                        min_runs: int = 3, max_runs: int = 200) -> float:
+    start = time.perf_counter()
+    await fn()
+    samples = [time.perf_counter() - start]
+    for _ in range(_repeats(samples[0], budget, min_runs, max_runs) - 1):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def regressions(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> Dict[str, float]:
+    """Benchmarks slower than baseline by more than ``threshold`` (0.2 = 20%),
+    mapped to their slowdown ratio."""
+    return {
+        name: results[name] / baseline[name]
+        for name in results
+        if name in baseline and baseline[name] > 0 and results[name] > baseline[name] * (1 + threshold)
+    }
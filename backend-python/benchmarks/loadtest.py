@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+import httpx
+from benchmarks import synthetic
+
+# Load generator reporting throughput and latency percentiles per route.
+#
+# In-process against app.main:app on the in-memory database:
+#   python -m benchmarks.loadtest --users 50 --concurrency 20 --duration 30
+# Against a running server (and its real MongoDB):
+#   python -m benchmarks.loadtest --target http://localhost:8000
+# (start it with RATE_LIMIT_ENABLED=false, or simulated users sharing one
+# address will mostly see 429s)
+#
+# --mix sets relative weights, e.g. list=60,create=10,stats=20,insights=10
+
+ROUTES = {
+    "list": ("GET", "/api/workouts/?limit=50"),
+    "create": ("POST", "/api/workouts/"),
+    "stats": ("GET", "/api/workouts/stats/summary"),
+    "insights": ("GET", "/api/ml/insights"),
+}
+
+def _mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {name!r}; choose from {', '.join(ROUTES)}")
+        mix[name] = int(weight)
+    return mix
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Drive a mix of API calls and report latency")
+    parser.add_argument("--target", help="Base URL; default runs app.main:app in-process")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seed-workouts", type=int, default=200, help="History per synthetic user")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to drive load")
+    parser.add_argument("--mix", type=_mix, default=_mix("list=60,create=10,stats=20,insights=10"))
+    return parser.parse_args()
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def _in_process_client() -> httpx.AsyncClient:
+    from passlib.context import CryptContext
+    from app.auth import security
+    from app.config import settings
+    from app.main import app
+    from benchmarks import memory_db
+
+    memory_db.install()
+    # Registration is setup, not the thing under test: keep hashing cheap
+    security.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+    # Every simulated user shares one client address
+    settings.rate_limit_enabled = False
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest")
+
+async def _register(client: httpx.AsyncClient, index: int, history: int, run_id: str) -> Dict[str, str]:
+    name = f"load{run_id}u{index}"
+    res = await client.post("/api/auth/register", json={
+        "username": name, "email": f"{name}@example.com", "password": "load-test-password",
+    })
+    res.raise_for_status()
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    if history:
+        body = "\n".join(json.dumps(w) for w in synthetic.workouts(history, seed=index))
+        res = await client.post("/api/workouts/import?format=ndjson", content=body, headers=headers)
+        res.raise_for_status()
+    return headers
+
+async def main():
+    args = parse_args()
+    client = httpx.AsyncClient(base_url=args.target, timeout=30) if args.target else _in_process_client()
+    run_id = str(int(time.time()))
+    names = list(args.mix)
+    weights = [args.mix[n] for n in names]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async with client:
+        print(f"Registering {args.users} users with {args.seed_workouts} workouts each...")
+        users = await asyncio.gather(*(
+            _register(client, i, args.seed_workouts, run_id) for i in range(args.users)
+        ))
+        new_workouts = synthetic.workouts(100, seed=99)
+        if not args.target:
+            # Same warm-up the lifespan hook does in production
+            from app.ml.executor import ml_executor
+            await ml_executor.warm("app.ml.engine")
+
+        deadline = time.perf_counter() + args.duration
+
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                method, url = ROUTES[name]
+                kwargs = {"json": rng.choice(new_workouts)} if method == "POST" else {}
+                start = time.perf_counter()
+                try:
+                    res = await client.request(method, url, headers=rng.choice(users), **kwargs)
+                    status = res.status_code
+                except httpx.HTTPError:
+                    status = 0
+                latencies[name].append(time.perf_counter() - start)
+                statuses[name][status] += 1
+
+        print(f"Driving load: concurrency={args.concurrency} for {args.duration:.0f}s")
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n{'route':<10} {'count':>7} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name in names:
+        samples = latencies.get(name)
+        if not samples:
+            continue
+        errors = sum(c for s, c in statuses[name].items() if s == 0 or s >= 400)
+        print(f"{name:<10} {len(samples):>7} {errors:>7} {len(samples) / elapsed:>8.1f} "
+              f"{percentile(samples, 50) * 1000:>8.1f} {percentile(samples, 95) * 1000:>8.1f} "
+              f"{percentile(samples, 99) * 1000:>8.1f}")
+    print(f"\nTotal: {total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+from app.database import db
+
+# In-memory stand-in for the Motor client, used by the benchmarks and the
+# load generator. Needs: pip install -r benchmarks/requirements.txt
+try:
+    import mongomock
+    from mongomock_motor import AsyncMongoMockClient
+    from pymongo import ReplaceOne, UpdateOne
+except ImportError as e:
+    raise SystemExit(f"{e}. Install benchmark dependencies: pip install -r benchmarks/requirements.txt")
+
+_bulk_write = mongomock.collection.Collection.bulk_write
+
+def _compatible_bulk_write(self, requests, ordered=True, **kwargs):
+    # mongomock's bulk_write does not understand newer pymongo operation
+    # objects; replay the two kinds the app uses one by one
+    if all(isinstance(op, (UpdateOne, ReplaceOne)) for op in requests):
+        for op in requests:
+            if isinstance(op, UpdateOne):
+                self.update_one(op._filter, op._doc, upsert=op._upsert)
+            else:
+                self.replace_one(op._filter, op._doc, upsert=op._upsert)
+        return None
+    return _bulk_write(self, requests, ordered=ordered, **kwargs)
+
+def install(monkeypatch=None):
+    """Point app.database.db at a fresh in-memory database.
+
+    Given a pytest ``monkeypatch``, both patches are undone after the test.
+    """
+    patch = monkeypatch.setattr if monkeypatch is not None else setattr
+    patch(mongomock.collection.Collection, "bulk_write", _compatible_bulk_write)
+    patch(db, "client", AsyncMongoMockClient())
+    return db
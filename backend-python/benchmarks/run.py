@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from benchmarks import bench_api, bench_engine
+from benchmarks.harness import regressions
+
+# Benchmark suite for MLEngine and the API hot paths.
+#
+#   python -m benchmarks.run --save benchmarks/baseline.json
+#   python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+#
+# Exits with status 1 when any benchmark is slower than the baseline by more
+# than the threshold.
+
+def _sizes(value: str):
+    return [int(v) for v in value.split(",") if v]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run MMA Tracker benchmarks")
+    parser.add_argument("--suite", choices=["all", "engine", "api"], default="all")
+    parser.add_argument("--engine-sizes", type=_sizes, default=[10, 100, 1000, 10_000, 100_000])
+    parser.add_argument("--api-sizes", type=_sizes, default=[100, 1000])
+    parser.add_argument("--budget", type=float, default=0.5, help="Seconds to spend per benchmark")
+    parser.add_argument("--save", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before failing (0.2 = 20%%)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = {}
+    if args.suite in ("all", "engine"):
+        results.update(bench_engine.run(args.engine_sizes, args.budget))
+    if args.suite in ("all", "api"):
+        results.update(asyncio.run(bench_api.run(args.api_sizes, args.budget)))
+
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        print(f"{name:<{width}} {seconds * 1000:>10.3f} ms")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                "python": sys.version.split()[0],
+                "machine": platform.platform(),
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        slower = regressions(results, baseline, args.threshold)
+        for name, ratio in sorted(slower.items()):
+            print(f"REGRESSION {name}: {ratio:.2f}x baseline")
+        if slower:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, get_args
+from app.models.workout import DisciplineType
+
+DISCIPLINES = list(get_args(DisciplineType))
+
+def workouts(n: int, seed: int = 0, end: Optional[date] = None) -> List[Dict[str, Any]]:
+    """``n`` workouts spread over roughly one session per day up to ``end``
+    (default today, so the insights recency window sees them), covering
+    every DisciplineType value."""
+    end = end or date.today()
+    rng = random.Random(seed)
+    span = max(28, n)
+    return [{
+        "discipline": DISCIPLINES[i % len(DISCIPLINES)] if i < len(DISCIPLINES) else rng.choice(DISCIPLINES),
+        "duration": rng.randrange(20, 150),
+        "intensity": rng.randrange(1, 11),
+        "notes": "",
+        "date": (end - timedelta(days=rng.randrange(span))).isoformat(),
+    } for i in range(n)]
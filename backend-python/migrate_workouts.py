@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import time
+from app.database import TIMESERIES_INDEXES, db
+from app.workout_storage import TIMESERIES_OPTIONS, session_time
+
+# Convert the workouts collection to the time-series layout.
+#
+# Usage:
+#   python migrate_workouts.py
+#   python migrate_workouts.py --legacy workouts_legacy --batch-size 5000
+#
+# Everything is first copied into a time-series --staging collection and
+# checked against the live one (count, plus sessions and minutes per
+# user); workouts is not touched unless that passes. Time-series
+# collections cannot be renamed, so the staging copy cannot simply replace
+# workouts: instead the plain collection is renamed to --legacy (never
+# dropped), a time-series workouts is created, filled from staging and
+# checked again. Stop writers while this runs, then start the app with
+# WORKOUT_STORAGE=timeseries.
+#
+# To go back: drop workouts and rename the legacy collection to workouts.
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Move workouts into a time-series collection")
+    parser.add_argument("--legacy", default="workouts_legacy",
+                        help="Name the existing plain collection is renamed to")
+    parser.add_argument("--staging", default="workouts_staging",
+                        help="Time-series collection the data is copied into and verified first")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    return parser.parse_args()
+
+async def collection_type(database, name: str):
+    cursor = await database.list_collections(filter={"name": name})
+    info = await cursor.to_list(length=1)
+    return info[0].get("type", "collection") if info else None
+
+async def copy(source, target, batch_size: int) -> int:
+    # Inserting in (userId, date) order fills each bucket before opening the next
+    cursor = source.find().sort([("userId", 1), ("date", 1)]).batch_size(batch_size)
+    copied = 0
+    batch = []
+    async for w in cursor:
+        batch.append({**w, "ts": session_time(w["date"])})
+        if len(batch) >= batch_size:
+            await target.insert_many(batch, ordered=False)
+            copied += len(batch)
+            batch = []
+    if batch:
+        await target.insert_many(batch, ordered=False)
+        copied += len(batch)
+    return copied
+
+async def fingerprint(collection):
+    # userId -> (sessions, minutes)
+    pipeline = [{"$group": {"_id": "$userId", "n": {"$sum": 1}, "minutes": {"$sum": "$duration"}}}]
+    return {row["_id"]: (row["n"], row["minutes"]) async for row in collection.aggregate(pipeline, allowDiskUse=True)}
+
+async def matches(source, target) -> bool:
+    expected, actual = await fingerprint(source), await fingerprint(target)
+    if expected == actual:
+        return True
+    differing = sorted(str(u) for u in expected.keys() | actual.keys() if expected.get(u) != actual.get(u))
+    print(f"{len(differing)} users differ, e.g. {', '.join(differing[:5])}")
+    return False
+
+async def main():
+    args = parse_args()
+    started = time.perf_counter()
+    db.connect()
+    database = db.get_db()
+    try:
+        current = await collection_type(database, "workouts")
+        if current == "timeseries":
+            print("workouts is already a time-series collection")
+            return
+        for name in (args.legacy, args.staging):
+            if await collection_type(database, name) is not None:
+                print(f"{name} already exists; drop it or pass another name")
+                return
+        if current is None:
+            await database.create_collection("workouts", timeseries=TIMESERIES_OPTIONS)
+            print("Created an empty time-series workouts collection")
+            return
+
+        # 1. Stage and verify while workouts stays as it is
+        staging = database[args.staging]
+        await database.create_collection(args.staging, timeseries=TIMESERIES_OPTIONS)
+        copied = await copy(database.workouts, staging, args.batch_size)
+        print(f"Staged {copied} workouts in {time.perf_counter() - started:.1f}s")
+        if not await matches(database.workouts, staging):
+            print(f"Staged copy differs; workouts was left untouched, {args.staging} kept for inspection")
+            return
+
+        # 2. Swap: keep the original as legacy, fill the new workouts from staging
+        await database.workouts.rename(args.legacy)
+        await database.create_collection("workouts", timeseries=TIMESERIES_OPTIONS)
+        await copy(staging, database.workouts, args.batch_size)
+        await database.workouts.create_indexes(TIMESERIES_INDEXES["workouts"])
+
+        legacy = database[args.legacy]
+        if not await matches(legacy, database.workouts):
+            print(f"workouts differs from {args.legacy}; roll back: drop workouts, "
+                  f"rename {args.legacy} to workouts")
+            return
+        await staging.drop()
+        print(f"Migrated {copied} workouts in {time.perf_counter() - started:.1f}s")
+        print(f"Set WORKOUT_STORAGE=timeseries, then drop {args.legacy} once verified")
+    finally:
+        db.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main())
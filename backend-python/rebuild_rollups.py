@@ -0,0 +1,20 @@
+import asyncio
+import sys
+from app.database import db
+from app.ml import rollups
+from app import weekly_stats
+
+# Usage: python rebuild_rollups.py [userId]
+async def main():
+    # Workouts reference users by their id string
+    user_id = sys.argv[1] if len(sys.argv) > 1 else None
+    db.connect()
+    try:
+        written = await rollups.rebuild(user_id)
+        print(f"Rebuilt {written} daily load rollups")
+        written = await weekly_stats.rebuild(user_id)
+        print(f"Rebuilt {written} weekly stats summaries")
+    finally:
+        db.disconnect()
+
+asyncio.run(main())
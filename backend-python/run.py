@@ -1,5 +1,7 @@
 import os
 import uvicorn
 
-port = int(os.environ.get("PORT", "8000"))
-uvicorn.run("app.main:app", host="0.0.0.0", port=port)
+if __name__ == "__main__":
+    # Guarded so spawned ML pool workers can re-import this module safely
+    port = int(os.environ.get("PORT", "8000"))
+    uvicorn.run("app.main:app", host="0.0.0.0", port=port)
@@ -0,0 +1,19 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.user import UserInDB
+from app.routes.deps import get_current_user
+
+USER_ID = "65f000000000000000000001"
+
+@pytest.fixture
+def override_user():
+    """Authenticate every request to the app as one test user."""
+    user = UserInDB(_id=USER_ID, username="u", email="u@example.com", passwordHash="")
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_user, None)
+
+@pytest.fixture
+def authed_client(override_user):
+    return TestClient(app)
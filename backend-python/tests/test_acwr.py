@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytest
+from app.ml import rollups
+from app.ml.acwr import acwr_series, ewma
+from app.ml.executor import ml_executor
+from app.ml.load import ACUTE_EWMA_LAMBDA, CHRONIC_EWMA_LAMBDA, burnout_from_daily_loads
+
+def test_rolling_acwr_matches_burnout_check():
+    rng = np.random.default_rng(3)
+    load = rng.integers(0, 600, 200).astype(float)
+    load[rng.random(200) < 0.3] = 0  # rest days
+    start = date(2024, 1, 1)
+    daily = {(start + timedelta(days=i)).isoformat(): v for i, v in enumerate(load) if v}
+
+    series = acwr_series(load)
+    for last in (40, 120, 199):
+        expected = burnout_from_daily_loads(daily, start.isoformat(), (start + timedelta(days=last)).isoformat())
+        assert series["acwr"][last] == pytest.approx(expected["acwr"], abs=0.01)
+
+def test_ewma_matches_recursive_definition():
+    load = np.array([0, 300, 0, 450, 200, 0, 0, 600], dtype=float)
+    expected, prev = [], 0.0
+    for x in load:
+        prev = ACUTE_EWMA_LAMBDA * x + (1 - ACUTE_EWMA_LAMBDA) * prev
+        expected.append(prev)
+    assert ewma(load, ACUTE_EWMA_LAMBDA) == pytest.approx(expected)
+
+def test_ewma_stays_exact_across_blocks():
+    load = np.random.default_rng(5).integers(0, 900, 4000).astype(float)
+    expected, prev = [], 0.0
+    for x in load:
+        prev = CHRONIC_EWMA_LAMBDA * x + (1 - CHRONIC_EWMA_LAMBDA) * prev
+        expected.append(prev)
+    assert ewma(load, CHRONIC_EWMA_LAMBDA) == pytest.approx(expected, rel=1e-9)
+
+def test_ratio_is_null_before_any_load_and_warmup_is_skipped():
+    series = acwr_series([0, 0, 0, 100, 0], skip=2)
+    assert series["load"] == [0, 100, 0]
+    assert series["acwr"][0] is None and series["acwrEwma"][0] is None
+    assert series["acwr"][1] == pytest.approx(4.0, abs=0.01)  # 100/7 over 100/28
+
+@pytest.fixture
+def client(monkeypatch, authed_client):
+    async def fake_last_write_at(user_id):
+        return datetime(2024, 3, 1, 12)
+
+    async def fake_daily_series(user_id, start, end):
+        days = (end - start).days + 1
+        return {"sessions": [1] * days, "load": [300] * days}
+
+    monkeypatch.setattr(rollups, "last_write_at", fake_last_write_at)
+    monkeypatch.setattr(rollups, "daily_series", fake_daily_series)
+    # ACWR must not queue behind clustering jobs in the ML pool
+    async def no_pool(*args):
+        raise AssertionError("ACWR should not use the ML pool")
+
+    monkeypatch.setattr(ml_executor, "run", no_pool)
+    return authed_client
+
+def test_acwr_endpoint_returns_requested_days(client):
+    res = client.get("/api/ml/acwr", params={"start": "2024-01-01", "end": "2024-01-10"})
+    assert res.status_code == 200
+    body = res.json()
+    assert len(body["acwr"]) == len(body["acwrEwma"]) == 10
+    # Steady load after a full warm-up: every ratio settles at 1
+    assert body["acwr"][0] == pytest.approx(1.0, abs=0.01)
+    assert body["acwrEwma"][0] == pytest.approx(1.0, abs=0.01)
+
+    res = client.get("/api/ml/acwr", params={"start": "2024-01-01", "end": "2024-01-10"},
+                     headers={"If-None-Match": res.headers["etag"]})
+    assert res.status_code == 304
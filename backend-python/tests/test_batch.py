@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+import pytest
+from app.ml.batch import BATCH_FIELDS, cohort_report
+from app.ml.engine import ALL_DISCIPLINES, MLEngine
+
+def _user_history(user_id, sessions, seed, disciplines=ALL_DISCIPLINES):
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    return [{
+        "userId": user_id,
+        "date": (start + timedelta(days=rng.randrange(90))).isoformat(),
+        "discipline": rng.choice(disciplines),
+        "duration": rng.randrange(20, 120),
+        "intensity": rng.randrange(1, 11),
+    } for _ in range(sessions)]
+
+def _columns(workouts):
+    return {f: [w[f] for w in workouts] for f in BATCH_FIELDS}
+
+@pytest.fixture
+def cohort():
+    return {
+        "a": _user_history("a", 60, seed=1),
+        "b": _user_history("b", 40, seed=2, disciplines=["Boxing", "Muay Thai", "BJJ"]),
+        "c": _user_history("c", 3, seed=3),
+        "d": _user_history("d", 80, seed=4, disciplines=["BJJ", "Wrestling", "Cardio"]),
+    }
+
+def test_cohort_report_matches_engine(cohort):
+    workouts = [w for history in cohort.values() for w in history]
+    report = cohort_report(_columns(workouts)).set_index("userId")
+
+    assert sorted(report.index) == sorted(cohort)
+    for user_id, history in cohort.items():
+        engine = MLEngine(history)
+        burnout = engine.predict_burnout()
+        row = report.loc[user_id]
+
+        assert row["sessions"] == len(history)
+        assert row["risk"] == burnout["risk"]
+        assert row["reason"] == burnout["reason"]
+        if "acwr" in burnout:
+            assert row["acwr"] == burnout["acwr"]
+        assert row["focus"] == engine.get_recommended_focus()
+        assert row["weakness"] == engine.analyze_weaknesses()[0]
+
+def test_cohort_report_discipline_distribution_sums_to_100(cohort):
+    report = cohort_report(_columns(cohort["a"]))
+    total = sum(report[f"pct_{d}"].iloc[0] for d in ALL_DISCIPLINES)
+    assert total == pytest.approx(100, abs=0.5)
+
+def test_cohort_report_empty():
+    assert cohort_report(_columns([])).empty
@@ -0,0 +1,59 @@
+import time
+from app.cache import TTLCache
+from app.ml.cache import InsightsCache
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    now[0] += 4
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_ttl_cache_counts_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hitRate"] == 0.667
+
+def test_insights_cache_bump_invalidates_user_only():
+    cache = InsightsCache(maxsize=10, ttl=60)
+    cache.set("u1", {"focus": "a"})
+    cache.set("u2", {"focus": "b"})
+    cache.bump("u1")
+    assert cache.get("u1") is None
+    assert cache.get("u2") == {"focus": "b"}
+
+def test_insights_cache_ignores_results_from_older_version():
+    cache = InsightsCache(maxsize=10, ttl=60)
+    version = cache.version("u1")
+    cache.bump("u1") # write lands while insights are computed
+    cache.set("u1", {"focus": "stale"}, version=version)
+    assert cache.get("u1") is None
+
+def test_insights_cache_versions_stay_bounded():
+    cache = InsightsCache(maxsize=2, ttl=60)
+    cache.set("u1", {"focus": "old"})
+    for user in ("u1", "u2", "u3"):
+        cache.bump(user)
+    assert len(cache.versions) == 2
+    # u1's version was evicted; its old entry must not come back
+    assert cache.get("u1") is None
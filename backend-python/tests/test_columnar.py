@@ -0,0 +1,51 @@
+import random
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from app.ml.columnar import WorkoutColumns
+from app.ml.engine import ALL_DISCIPLINES, MLEngine
+
+def _history(sessions, seed, days=120, disciplines=ALL_DISCIPLINES):
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    return [{
+        "discipline": rng.choice(disciplines),
+        "duration": rng.randrange(10, 150),
+        "intensity": rng.randrange(1, 11),
+        "date": (start + timedelta(days=rng.randrange(days))).isoformat(),
+    } for _ in range(sessions)]
+
+@pytest.mark.parametrize("workouts", [
+    [],
+    _history(3, seed=1),
+    _history(8, seed=2, days=10),
+    _history(40, seed=3),
+    _history(200, seed=4, disciplines=["Boxing", "Muay Thai", "Cardio"]),
+    _history(500, seed=5, days=400),
+    _history(60, seed=6, disciplines=["BJJ", "Wrestling", "Sparring"]),
+])
+def test_fast_path_matches_pandas_path(workouts):
+    fast = MLEngine(workouts)
+    slow = MLEngine(workouts, fast_path_max_rows=0)
+    assert fast.columns is not None
+    assert slow.columns is None
+
+    assert fast.analyze_weaknesses() == slow.analyze_weaknesses()
+    assert fast.predict_burnout() == slow.predict_burnout()
+    assert fast.get_recommended_focus() == slow.get_recommended_focus()
+
+def test_columns_encode_disciplines_and_days():
+    columns = WorkoutColumns.from_records([
+        {"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-01"},
+        {"discipline": "Boxing", "duration": 30, "intensity": 8, "date": "2024-01-03"},
+        {"discipline": "BJJ", "duration": 45, "intensity": 4, "date": "2024-01-03"},
+    ])
+    assert columns.disciplines == ["BJJ", "Boxing"]
+    assert columns.discipline_counts() == {"BJJ": 2, "Boxing": 1}
+    assert columns.discipline_durations() == {"BJJ": 105, "Boxing": 30}
+    np.testing.assert_array_equal(columns.daily_load(), [300, 0, 420])
+
+def test_pandas_frame_is_built_lazily():
+    engine = MLEngine([{"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-01"}])
+    assert engine._df is None
+    assert engine.df['load'].iloc[0] == 300
@@ -0,0 +1,59 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from app.auth.security import create_access_token
+from app.config import settings
+from app.routes import deps
+
+USER_ID = ObjectId()
+USER = {"_id": USER_ID, "username": "khabib", "email": "k@example.com", "passwordHash": "x"}
+
+class _Users:
+    def __init__(self):
+        self.lookups = 0
+
+    async def find_one(self, query):
+        self.lookups += 1
+        return USER if query["_id"] == USER_ID else None
+
+@pytest.fixture
+def users(monkeypatch):
+    users = _Users()
+    monkeypatch.setattr(deps.db, "get_db", lambda: SimpleNamespace(users=users))
+    deps.token_cache.clear()
+    deps.user_cache.clear()
+    return users
+
+def _token():
+    claims = {"sub": str(USER_ID), "username": USER["username"], "email": USER["email"]}
+    return create_access_token(claims, expires_delta=timedelta(minutes=5))
+
+def test_repeat_requests_hit_the_cache(users):
+    token = _token()
+    first = asyncio.run(deps.get_current_user(token))
+    second = asyncio.run(deps.get_current_user(token))
+    assert first.username == second.username == "khabib"
+    assert users.lookups == 1
+
+def test_invalidate_user_forces_lookup(users):
+    token = _token()
+    asyncio.run(deps.get_current_user(token))
+    deps.invalidate_user(USER_ID)
+    asyncio.run(deps.get_current_user(token))
+    assert users.lookups == 2
+
+def test_trusted_claims_skip_lookup(users, monkeypatch):
+    monkeypatch.setattr(settings, "trust_token_claims", True)
+    user = asyncio.run(deps.get_current_user(_token()))
+    assert user.id == str(USER_ID)
+    assert user.email == "k@example.com"
+    assert users.lookups == 0
+
+def test_expired_token_is_rejected(users):
+    claims = {"sub": str(USER_ID)}
+    token = create_access_token(claims, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(deps.HTTPException) as exc:
+        asyncio.run(deps.get_current_user(token))
+    assert exc.value.status_code == 401
@@ -0,0 +1,84 @@
+import asyncio
+import pickle
+from datetime import date
+from app.ml.columnar import WorkoutColumns
+from app.ml.engine import compute_insights
+from app.ml.feed import FEED_PROJECTION, ColumnFeed, load_feed
+
+DISCIPLINES = ["Boxing", "BJJ", "Wrestling", "Muay Thai", "Cardio"]
+
+def _history(n=40):
+    return [
+        {
+            "date": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}",
+            "discipline": DISCIPLINES[i % len(DISCIPLINES)],
+            "duration": 30 + (i * 7) % 60,
+            "intensity": 1 + i % 10,
+            "notes": "long free text " * 20,
+        }
+        for i in range(n)
+    ]
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = {}
+
+    def sort(self, key, direction):
+        self.calls["sort"] = (key, direction)
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.calls["limit"] = n
+        self.docs = self.docs[:n]
+        return self
+
+    def batch_size(self, n):
+        self.calls["batch_size"] = n
+        return self
+
+    async def __aiter__(self):
+        for d in self.docs:
+            yield d
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection):
+        self.query, self.projection = query, projection
+        since = query.get("date", {}).get("$gte", "")
+        docs = [{k: d[k] for k in projection if projection[k]} for d in self.docs if d["date"] >= since]
+        self.cursor = FakeCursor(docs)
+        return self.cursor
+
+def test_feed_matches_record_path():
+    history = _history()
+    feed = ColumnFeed()
+    for w in reversed(history):  # newest first, as load_feed yields them
+        feed.append(w)
+
+    assert compute_insights(feed)["weaknesses"] == compute_insights(history)["weaknesses"]
+    assert compute_insights(feed)["focus"] == compute_insights(history)["focus"]
+    assert pickle.loads(pickle.dumps(feed)).day == feed.day
+
+def test_columns_round_trip_through_feed():
+    history = _history(10)
+    feed = ColumnFeed()
+    for w in reversed(history):
+        feed.append(w)
+    records = WorkoutColumns.from_feed(feed).to_records()
+    assert records == [{k: w[k] for k in ("date", "discipline", "duration", "intensity")} for w in history]
+
+def test_load_feed_windows_projects_and_caps():
+    collection = FakeCollection(_history())
+    feed = asyncio.run(load_feed(
+        collection, "u1", window_days=30, max_sessions=10, batch_size=4, today=date(2024, 2, 10),
+    ))
+
+    assert collection.query == {"userId": "u1", "date": {"$gte": "2024-01-11"}}
+    assert collection.projection == FEED_PROJECTION
+    assert collection.cursor.calls == {"sort": ("date", -1), "limit": 10, "batch_size": 4}
+    assert len(feed) == 10
+    assert WorkoutColumns.from_feed(feed).to_records()[-1]["date"] == "2024-02-12"
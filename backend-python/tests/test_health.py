@@ -0,0 +1,41 @@
+import time
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.database import db
+from app.main import app
+
+def test_health_serves_cached_ping(monkeypatch):
+    async def no_ping():
+        raise AssertionError("health probe should not ping when a result is cached")
+
+    monkeypatch.setattr(db, "health", {"database": "connected", "checkedAt": time.time() - 3})
+    monkeypatch.setattr(db, "check_health", no_ping)
+    body = TestClient(app).get("/api/health").json()
+    assert body["database"] == "connected"
+    assert 2.5 <= body["databaseCheckedAgoSeconds"] < 10
+
+def test_health_pings_once_before_first_check(monkeypatch):
+    calls = []
+
+    async def ping():
+        calls.append(1)
+        db.health = {"database": "connected", "checkedAt": time.time()}
+        return db.health
+
+    monkeypatch.setattr(db, "health", None)
+    monkeypatch.setattr(db, "check_health", ping)
+    client = TestClient(app)
+    client.get("/api/health")
+    client.get("/api/health")
+    assert calls == [1]
+
+def test_startup_survives_an_unreachable_database(monkeypatch):
+    monkeypatch.setattr(settings, "mongodb_uri", "mongodb://127.0.0.1:1/")
+    monkeypatch.setattr(settings, "mongo_server_selection_timeout_ms", 100)
+    monkeypatch.setattr(settings, "mongo_warm_connections", 1)
+    monkeypatch.setattr(settings, "ml_warmup", False)
+    monkeypatch.setattr(settings, "insights_precompute", False)
+    monkeypatch.setattr(db, "health", None)
+    with TestClient(app) as client:
+        body = client.get("/api/health").json()
+    assert body["database"].startswith("error")
@@ -0,0 +1,60 @@
+from datetime import datetime
+import pytest
+from app.ml import rollups
+
+@pytest.fixture
+def client(monkeypatch, authed_client):
+    calls = {"series": 0}
+    last_write = {"at": datetime(2024, 3, 1, 12)}
+
+    async def fake_last_write_at(user_id):
+        return last_write["at"]
+
+    async def fake_daily_series(user_id, start, end):
+        calls["series"] += 1
+        days = (end - start).days + 1
+        return {"sessions": [1] * days, "load": [300] * days}
+
+    monkeypatch.setattr(rollups, "last_write_at", fake_last_write_at)
+    monkeypatch.setattr(rollups, "daily_series", fake_daily_series)
+    return authed_client, calls, last_write
+
+def test_heatmap_returns_dense_days_and_etag(client):
+    http, calls, _ = client
+    res = http.get("/api/workouts/heatmap", params={"start": "2024-01-01", "end": "2024-01-07"})
+    assert res.status_code == 200
+    assert res.json()["sessions"] == [1] * 7
+    assert res.headers["etag"].startswith('"')
+
+def test_heatmap_conditional_get(client):
+    http, calls, last_write = client
+    params = {"start": "2024-01-01", "end": "2024-12-31"}
+    etag = http.get("/api/workouts/heatmap", params=params).headers["etag"]
+
+    res = http.get("/api/workouts/heatmap", params=params, headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert calls["series"] == 1
+
+    last_write["at"] = datetime(2024, 3, 2)
+    res = http.get("/api/workouts/heatmap", params=params, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+
+def test_heatmap_rejects_reversed_range(client):
+    http, _, _ = client
+    res = http.get("/api/workouts/heatmap", params={"start": "2024-02-01", "end": "2024-01-01"})
+    assert res.status_code == 400
+
+def test_heatmap_rejects_impossible_dates(client):
+    http, calls, _ = client
+    for params in ({"start": "2024-13-45"}, {"start": "2024-01-01", "end": "2024-02-30"}):
+        assert http.get("/api/workouts/heatmap", params=params).status_code == 400
+    assert calls["series"] == 0
+
+def test_weak_and_wildcard_validators_match(client):
+    http, calls, _ = client
+    params = {"start": "2024-01-01", "end": "2024-01-31"}
+    etag = http.get("/api/workouts/heatmap", params=params).headers["etag"]
+    for header in (f"W/{etag}", f'"other", {etag}', "*"):
+        assert http.get("/api/workouts/heatmap", params=params, headers={"If-None-Match": header}).status_code == 304
+    assert http.get("/api/workouts/heatmap", params=params, headers={"If-None-Match": '"other"'}).status_code == 200
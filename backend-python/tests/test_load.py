@@ -0,0 +1,57 @@
+import pytest
+from collections import defaultdict
+from datetime import datetime, timedelta
+from app.ml.engine import MLEngine
+from app.ml.load import burnout_from_daily_loads, workout_day, workout_load
+from app.ml.rollups import _day_deltas
+
+def _daily(workouts):
+    daily = defaultdict(float)
+    for w in workouts:
+        daily[workout_day(w)] += workout_load(w)
+    days = sorted(daily)
+    return daily, days[0], days[-1]
+
+def _history(days, acute_days=7, acute=(90, 9), chronic=(30, 3)):
+    base_date = datetime(2024, 6, 30)
+    workouts = []
+    for i in range(days):
+        duration, intensity = acute if i < acute_days else chronic
+        workouts.append({
+            "discipline": "Boxing",
+            "duration": duration,
+            "intensity": intensity,
+            "date": (base_date - timedelta(days=i)).strftime('%Y-%m-%d'),
+        })
+    return workouts
+
+@pytest.mark.parametrize("workouts", [
+    _history(30, acute_days=0),
+    _history(50),
+    _history(400, acute_days=3),
+    _history(28, acute=(60, 6)),
+    _history(20),
+])
+def test_rollup_burnout_matches_engine(workouts):
+    daily, first, last = _daily(workouts)
+    assert burnout_from_daily_loads(daily, first, last) == MLEngine(workouts).predict_burnout()
+
+def test_rollup_burnout_counts_missing_days_as_rest():
+    daily = {"2024-01-01": 300, "2024-01-28": 300}
+    result = burnout_from_daily_loads(daily, "2024-01-01", "2024-01-28")
+    # acute = 300 / 7, chronic = 600 / 28 -> ACWR = 2.0
+    assert result["risk"] == "High"
+    assert result["acwr"] == 2.0
+
+def test_day_deltas_for_update_moves_load():
+    before = {"date": "2024-01-01", "duration": 60, "intensity": 5}
+    after = {"date": "2024-01-02", "duration": 30, "intensity": 4}
+    deltas = _day_deltas([before], [after])
+    assert deltas == {
+        "2024-01-01": {"load": -300, "sessions": -1},
+        "2024-01-02": {"load": 120, "sessions": 1},
+    }
+
+def test_day_deltas_skips_unchanged_days():
+    w = {"date": "2024-01-01", "duration": 60, "intensity": 5}
+    assert _day_deltas([w], [dict(w)]) == {}
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from app.main import app
+from app.metrics import MongoCommandMetrics, Registry
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("op_seconds", "Op latency", ["op"], buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, op="save")
+    text = registry.render()
+    assert 'op_seconds_bucket{op="save",le="0.1"} 2' in text
+    assert 'op_seconds_bucket{op="save",le="1"} 3' in text
+    assert 'op_seconds_bucket{op="save",le="+Inf"} 4' in text
+    assert 'op_seconds_count{op="save"} 4' in text
+    assert 'op_seconds_sum{op="save"} 3.65' in text
+
+def test_counter_and_collector_escape_labels():
+    registry = Registry()
+    registry.counter("errors_total", "Errors", ["kind"]).inc(kind='say "hi"')
+    registry.collector(lambda: [("up", "gauge", "Up", [({}, 1)])])
+    text = registry.render()
+    assert 'errors_total{kind="say \\"hi\\""} 1' in text
+    assert "# TYPE up gauge\nup 1" in text
+
+def test_mongo_listener_records_commands():
+    listener = MongoCommandMetrics()
+    listener.succeeded(SimpleNamespace(command_name="find", duration_micros=1500))
+    listener.failed(SimpleNamespace(command_name="insert", duration_micros=200))
+    text = TestClient(app).get("/api/metrics").text
+    assert 'mongo_command_duration_seconds_count{command="find"}' in text
+    assert 'mongo_command_failures_total{command="insert"} 1' in text
+
+def test_metrics_endpoint_reports_routes_by_template():
+    client = TestClient(app)
+    client.get("/api/workouts/abc")  # unauthenticated -> 401
+    text = client.get("/api/metrics").text
+    assert 'http_responses_total{method="GET",route="/api/workouts/{id}",status="401"}' in text
+    assert "ml_executor_queue_depth 0" in text
+    assert 'cache_hits_total{cache="insights"}' in text
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from app.ml.executor import MLExecutor, QueueFullError
+
+def _add(a, b):
+    return a + b
+
+def _block(event):
+    event.wait(5)
+    return "done"
+
+def test_runs_job_and_records_metrics():
+    async def scenario():
+        executor = MLExecutor("thread", workers=1, queue_size=1, timeout=5)
+        try:
+            assert await executor.run(_add, 2, 3) == 5
+            await asyncio.sleep(0) # let the done callback land
+            return executor.stats()
+        finally:
+            executor.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["completed"] == 1
+    assert stats["queueDepth"] == 0
+
+def test_rejects_when_queue_is_full():
+    async def scenario():
+        executor = MLExecutor("thread", workers=1, queue_size=1, timeout=5)
+        release = threading.Event()
+        try:
+            running = asyncio.ensure_future(executor.run(_block, release))
+            queued = asyncio.ensure_future(executor.run(_block, release))
+            await asyncio.sleep(0.05)
+            assert executor.queue_depth == 1
+            with pytest.raises(QueueFullError):
+                await executor.run(_add, 1, 1)
+            release.set()
+            assert await running == "done"
+            assert await queued == "done"
+            return executor.stats()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+
+def test_times_out_but_keeps_slot_until_job_finishes():
+    async def scenario():
+        executor = MLExecutor("thread", workers=1, queue_size=0, timeout=0.05)
+        release = threading.Event()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await executor.run(_block, release)
+            # The job is still running in the pool, so there is no capacity
+            with pytest.raises(QueueFullError):
+                await executor.run(_add, 1, 1)
+            release.set()
+            await asyncio.sleep(0.05)
+            assert await executor.run(_add, 1, 1) == 2
+            return executor.stats()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["timeouts"] == 1
+
+def test_runs_named_target_and_warms_workers():
+    async def scenario():
+        executor = MLExecutor("thread", workers=2, queue_size=0, timeout=5)
+        try:
+            await executor.warm("app.ml.load")
+            return await executor.run("app.ml.load:assess_acwr", 2.0)
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(scenario())["risk"] == "High"
+
+def test_replaces_pool_after_a_worker_dies():
+    async def scenario():
+        executor = MLExecutor("process", workers=1, queue_size=0, timeout=30)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                # Kills its worker on the first attempt and again on the retry
+                await executor.run("os:_exit", 1)
+            assert await executor.run("operator:add", 2, 3) == 5
+            await asyncio.sleep(0)
+            return executor.stats()
+        finally:
+            executor.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["restarts"] == 2
+    assert stats["running"] == 0
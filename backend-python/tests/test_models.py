@@ -0,0 +1,23 @@
+import json
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+from app.main import app
+from app.models.workout import WorkoutCreate, WorkoutListResponse
+
+def test_workout_dates_must_be_iso_days():
+    base = {"discipline": "BJJ", "duration": 60, "intensity": 5}
+    assert WorkoutCreate(**base, date="2024-01-05T18:30:00").date == "2024-01-05T18:30:00"
+    for bad in ("01/05/2024", "2024-02-30", "20240105"):
+        with pytest.raises(ValidationError):
+            WorkoutCreate(**base, date=bad)
+
+def test_documented_workout_shape_matches_the_body():
+    doc = {
+        "_id": ObjectId(), "userId": "u", "discipline": "BJJ", "duration": 60, "intensity": 5,
+        "date": "2024-03-01", "createdAt": datetime(2024, 3, 1), "updatedAt": datetime(2024, 3, 1),
+    }
+    body = json.loads(WorkoutListResponse(workouts=[doc]).model_dump_json())
+    documented = app.openapi()["components"]["schemas"]["WorkoutResponse"]["properties"]
+    assert set(body["workouts"][0]) == set(documented)
@@ -0,0 +1,23 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.routes.workouts import decode_cursor, encode_cursor
+
+def test_cursor_round_trip_builds_keyset_query():
+    oid = ObjectId()
+    created = datetime(2024, 3, 1, 12, 30, 15, 123000)
+    token = encode_cursor({"date": "2024-03-01", "createdAt": created, "_id": oid})
+
+    query = decode_cursor(token)
+    assert query["date"] == {"$lte": "2024-03-01"}
+    assert query["$or"] == [
+        {"date": {"$lt": "2024-03-01"}},
+        {"date": "2024-03-01", "createdAt": {"$lt": created}},
+        {"date": "2024-03-01", "createdAt": created, "_id": {"$lt": oid}},
+    ]
+
+def test_invalid_cursor_is_a_400():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
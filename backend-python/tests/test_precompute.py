@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from app.config import settings
+from app.ml import precompute
+from app.ml.cache import insights_cache
+from app.ml.executor import QueueFullError
+from app.ml.precompute import InsightsPrecomputer, insights_precompute
+from tests.conftest import USER_ID
+
+def _run_worker(worker, scenario):
+    async def main():
+        task = asyncio.create_task(worker.run())
+        try:
+            await scenario()
+        finally:
+            task.cancel()
+    asyncio.run(main())
+
+def test_bursts_of_writes_coalesce(monkeypatch):
+    calls = []
+
+    async def fake_compute(user_id, run=None):
+        calls.append(user_id)
+
+    monkeypatch.setattr(precompute, "compute_and_store", fake_compute)
+    worker = InsightsPrecomputer(delay=0.05, max_delay=1, concurrency=1)
+
+    async def scenario():
+        for _ in range(3):
+            worker.mark_dirty("u1")
+            await asyncio.sleep(0.01)
+        worker.mark_dirty("u2")
+        await asyncio.sleep(0.2)
+
+    _run_worker(worker, scenario)
+    assert sorted(calls) == ["u1", "u2"]
+    assert worker.stats()["computed"] == 2
+
+def test_steady_writes_do_not_starve_refresh(monkeypatch):
+    calls = []
+
+    async def fake_compute(user_id, run=None):
+        calls.append(user_id)
+
+    monkeypatch.setattr(precompute, "compute_and_store", fake_compute)
+    worker = InsightsPrecomputer(delay=0.05, max_delay=0.1, concurrency=1)
+
+    async def scenario():
+        for _ in range(15):
+            worker.mark_dirty("u1")
+            await asyncio.sleep(0.02)
+
+    _run_worker(worker, scenario)
+    assert len(calls) >= 1
+
+def test_busy_pool_requeues_user(monkeypatch):
+    attempts = []
+
+    async def busy_then_ok(user_id, run=None):
+        attempts.append(user_id)
+        if len(attempts) == 1:
+            raise QueueFullError("ML queue is full")
+
+    monkeypatch.setattr(precompute, "compute_and_store", busy_then_ok)
+    worker = InsightsPrecomputer(delay=0.02, max_delay=1, concurrency=1)
+
+    async def scenario():
+        worker.mark_dirty("u1")
+        await asyncio.sleep(0.15)
+
+    _run_worker(worker, scenario)
+    assert attempts == ["u1", "u1"]
+    assert worker.stats() == {"dirtyUsers": 0, "computed": 1, "retried": 1, "failed": 0}
+
+@pytest.fixture
+def client(monkeypatch, authed_client):
+    stored = {"value": None}
+
+    async def fake_load_stored(user_id):
+        return stored["value"]
+
+    async def fail_compute(user_id, run=None):
+        raise AssertionError("stored insights should be served")
+
+    monkeypatch.setattr(precompute, "load_stored", fake_load_stored)
+    monkeypatch.setattr(precompute, "compute_and_store", fail_compute)
+    monkeypatch.setattr(settings, "insights_precompute", True)
+    insights_cache.entries.clear()
+    yield authed_client, stored
+    insights_precompute.dirty.clear()
+    insights_cache.entries.clear()
+
+def test_stale_result_is_served_and_queued(client):
+    http, stored = client
+    stored["value"] = {"weaknesses": [], "burnout": {}, "focus": "Maintain Mix",
+                       "stale": True, "computedAt": "2024-03-01T00:00:00+00:00"}
+
+    body = http.get("/api/ml/insights").json()
+    assert body["stale"] is True
+    assert USER_ID in insights_precompute.dirty
+
+def test_fresh_result_is_cached_in_memory(client):
+    http, stored = client
+    stored["value"] = {"weaknesses": [], "burnout": {}, "focus": "Maintain Mix",
+                       "stale": False, "computedAt": "2024-03-01T00:00:00+00:00"}
+
+    assert http.get("/api/ml/insights").json()["stale"] is False
+    stored["value"] = None
+    assert http.get("/api/ml/insights").json()["focus"] == "Maintain Mix"
+    assert USER_ID not in insights_precompute.dirty
@@ -0,0 +1,31 @@
+import os
+from types import SimpleNamespace
+from app.config import settings
+from app.profiling import profile_call, profiling_requested
+
+def _request(headers=None, query=None):
+    return SimpleNamespace(headers=headers or {}, query_params=query or {})
+
+def test_profiling_requires_matching_token(monkeypatch):
+    monkeypatch.setattr(settings, "profile_token", "")
+    assert not profiling_requested(_request({"X-Profile": ""}))
+
+    monkeypatch.setattr(settings, "profile_token", "s3cret")
+    assert profiling_requested(_request({"X-Profile": "s3cret"}))
+    assert profiling_requested(_request(query={"profile": "s3cret"}))
+    assert not profiling_requested(_request({"X-Profile": "guess"}))
+    assert not profiling_requested(_request())
+
+def test_profile_call_writes_profile_and_summary(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    workouts = [
+        {"date": f"2024-01-{d:02d}", "discipline": "Boxing", "duration": 60, "intensity": 7}
+        for d in range(1, 8)
+    ]
+    result, path = profile_call("app.ml.engine:compute_insights", (workouts,), "insights-abc/../x")
+
+    assert "weaknesses" in result
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.exists(path)
+    with open(path[:-len(".prof")] + ".txt") as f:
+        assert "compute_insights" in f.read()
@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.rate_limit import TokenBucketLimiter, rate_limiter
+
+def test_bucket_allows_burst_then_refills():
+    limiter = TokenBucketLimiter(rate=1, burst=4, max_keys=10)
+    assert limiter.acquire("u", 2, now=0) == 0
+    assert limiter.acquire("u", 2, now=0) == 0
+    assert limiter.acquire("u", 2, now=0) == pytest.approx(2.0)
+    assert limiter.acquire("u", 2, now=1.5) == pytest.approx(0.5)
+    assert limiter.acquire("u", 2, now=2.5) == 0
+    # Other keys have their own bucket
+    assert limiter.acquire("v", 4, now=2.5) == 0
+    assert limiter.stats()["limited"] == 2
+
+def test_idle_and_excess_keys_are_evicted():
+    limiter = TokenBucketLimiter(rate=1, burst=10, max_keys=3)
+    for i, key in enumerate("abcd"):
+        limiter.acquire(key, 1, now=i)
+    assert list(limiter.buckets) == ["b", "c", "d"]
+
+    # Idle past a full refill: indistinguishable from a new client
+    limiter.acquire("e", 1, now=12.5)
+    assert list(limiter.buckets) == ["d", "e"]
+    assert limiter.stats()["evicted"] == 3
+
+def test_login_is_limited_per_client_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_costs", {"login": 30})
+    rate_limiter.buckets.clear()
+    client = TestClient(app)
+
+    # Rejected by the body validator, but only after paying for admission
+    assert client.post("/api/auth/login", json={}).status_code == 422
+    res = client.post("/api/auth/login", json={})
+    assert res.status_code == 429
+    assert int(res.headers["retry-after"]) >= 1
+    assert 'rate_limited_total{route="login"}' in client.get("/api/metrics").text
+    rate_limiter.buckets.clear()
+
+def test_forwarded_for_is_only_believed_from_trusted_proxies(monkeypatch):
+    from starlette.requests import Request
+    from app.rate_limit import client_ip
+
+    def request(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+    # Nothing trusted: a spoofed header changes nothing
+    assert client_ip(request("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+    monkeypatch.setattr(settings, "rate_limit_trusted_proxies", ["10.0.0.0/8"])
+    assert client_ip(request("10.0.0.2", "198.51.100.1")) == "198.51.100.1"
+    # Client-supplied hops left of the last untrusted one are ignored
+    assert client_ip(request("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.7")) == "198.51.100.1"
+    assert client_ip(request("10.0.0.2")) == "10.0.0.2"
+    assert client_ip(request("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+def test_costs_above_the_burst_are_rejected():
+    from pydantic import ValidationError
+    from app.config import Settings
+
+    with pytest.raises(ValidationError, match="exceed rate_limit_burst"):
+        Settings(rate_limit_burst=30, rate_limit_costs={"login": 50})
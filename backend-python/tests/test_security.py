@@ -0,0 +1,28 @@
+import asyncio
+from passlib.context import CryptContext
+from app.auth import security
+from app.auth.security import PasswordHasher
+
+def test_hasher_hashes_and_verifies_off_loop():
+    async def scenario():
+        hasher = PasswordHasher(workers=2)
+        hashed = await hasher.hash("armbar")
+        results = await asyncio.gather(
+            hasher.verify("armbar", hashed),
+            hasher.verify("kimura", hashed),
+        )
+        return results, hasher.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [True, False]
+    assert stats["calls"] == 3
+    assert stats["inFlight"] == 0
+
+def test_cost_change_requires_rehash(monkeypatch):
+    old = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("armbar")
+    monkeypatch.setattr(
+        security, "pwd_context",
+        CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5),
+    )
+    assert security.password_needs_rehash(old)
+    assert not security.password_needs_rehash(security.get_password_hash("armbar"))
@@ -0,0 +1,51 @@
+import gzip
+import pytest
+from app.static_site import IMMUTABLE, REVALIDATE, StaticSite, accepted_encodings
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<html>" + "app " * 200 + "</html>")
+    (tmp_path / "favicon.png").write_bytes(b"\x89PNG....")
+    bundle = tmp_path / "assets" / "index-4f2a1c.js"
+    bundle.write_text("console.log('x');" * 100)
+    (tmp_path / "assets" / "index-4f2a1c.js.br").write_bytes(b"brotli-bytes")
+    return StaticSite(str(tmp_path), gzip_max_bytes=1_000_000)
+
+def test_accept_encoding_respects_q_values():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert accepted_encodings("") == set()
+
+def test_hashed_assets_prefer_shipped_brotli_and_are_immutable(site):
+    res = site.response("assets/index-4f2a1c.js", accept_encoding="gzip, br")
+    assert res.headers["content-encoding"] == "br"
+    assert res.headers["cache-control"] == IMMUTABLE
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert res.path.endswith(".br")
+
+    res = site.response("assets/index-4f2a1c.js", accept_encoding="gzip")
+    assert res.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(res.body) == ("console.log('x');" * 100).encode()
+
+    res = site.response("assets/index-4f2a1c.js")
+    assert "content-encoding" not in res.headers
+
+def test_unknown_paths_fall_back_to_index_except_assets(site):
+    res = site.response("dashboard/stats", accept_encoding="gzip")
+    assert res.media_type == "text/html"
+    assert res.headers["cache-control"] == REVALIDATE
+    assert gzip.decompress(res.body).startswith(b"<html>")
+    assert site.response("assets/missing-123.js").status_code == 404
+
+def test_conditional_get_returns_304_per_encoding(site):
+    etag = site.response("index.html", accept_encoding="gzip").headers["etag"]
+    assert site.response("index.html", accept_encoding="gzip", if_none_match=etag).status_code == 304
+    # The identity representation has its own tag
+    assert site.response("index.html", if_none_match=etag).status_code == 200
+
+def test_binary_files_are_not_compressed(site):
+    res = site.response("favicon.png", accept_encoding="gzip, br")
+    assert "content-encoding" not in res.headers
+    assert "vary" not in res.headers
+    assert site.stats() == {"files": 3, "br": 1, "gzip": 2}
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import date
+import pytest
+
+# Needs the in-memory Mongo from benchmarks/requirements.txt (installed by CI)
+pytest.importorskip("mongomock_motor")
+
+from benchmarks import memory_db
+from app.config import settings
+from app.ml.feed import load_feed
+from tests.conftest import USER_ID
+
+@pytest.fixture
+def finds(monkeypatch):
+    """Records (filter, sort keys) of every find that reaches Mongo."""
+    monkeypatch.setattr(settings, "workout_storage", "timeseries")
+    monkeypatch.setattr(settings, "insights_precompute", False)
+    database = memory_db.install(monkeypatch).get_db()
+
+    calls = []
+    collection = type(database.workouts)
+    find = collection.find
+
+    def spy(self, *args, **kwargs):
+        cursor = find(self, *args, **kwargs)
+        sort = cursor.sort
+
+        def record_sort(*keys, **kw):
+            calls.append((args[0] if args else {}, keys))
+            return sort(*keys, **kw)
+
+        cursor.sort = record_sort
+        return cursor
+
+    monkeypatch.setattr(collection, "find", spy)
+    return calls
+
+def test_routes_filter_and_sort_on_ts(finds, authed_client):
+    for day in ("2024-03-01", "2024-03-03", "2024-03-02", "2024-03-03"):
+        workout = {"discipline": "BJJ", "duration": 60, "intensity": 5, "date": day}
+        assert authed_client.post("/api/workouts/", json=workout).status_code == 201
+
+    first = authed_client.get("/api/workouts/", params={"limit": 2}).json()
+    second = authed_client.get("/api/workouts/", params={"limit": 2, "after": first["nextCursor"]}).json()
+    listed = first["workouts"] + second["workouts"]
+    assert [w["date"] for w in listed] == ["2024-03-03", "2024-03-03", "2024-03-02", "2024-03-01"]
+    assert len({w["id"] for w in listed}) == 4
+
+    assert authed_client.get("/api/workouts/export").text.count("\n") == 4
+
+    database = memory_db.db.get_db()
+    stored = asyncio.run(database.workouts.find_one({"date": "2024-03-01"}))
+    assert stored["ts"].date() == date(2024, 3, 1)
+    feed = asyncio.run(load_feed(database.workouts, USER_ID, window_days=1, max_sessions=10,
+                                 batch_size=10, today=date(2024, 3, 3)))
+    assert len(feed) == 3
+
+    assert finds
+    for query, keys in finds:
+        order = keys[0] if isinstance(keys[0], list) else [keys]
+        assert order[0][0] == "ts"
+        assert "date" not in query
+        assert all("date" not in clause for clause in query.get("$or", []))
@@ -0,0 +1,89 @@
+import asyncio
+from collections import defaultdict
+from types import SimpleNamespace
+from app import weekly_stats
+from app.database import db
+from app.weekly_stats import _deltas, summarize, week_of
+
+WORKOUTS = [
+    {"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-29"},
+    {"discipline": "BJJ", "duration": 90, "intensity": 7, "date": "2024-01-31"},
+    {"discipline": "Boxing", "duration": 30, "intensity": 8, "date": "2024-02-01"},
+    {"discipline": "Boxing", "duration": 45, "intensity": 6, "date": "2024-02-05"},
+]
+
+def _apply(docs, deltas):
+    # Mimic Mongo's $inc on dotted paths
+    for start, inc in deltas.items():
+        doc = docs.setdefault(start, {"weekStart": start, "days": {}})
+        for path, value in inc.items():
+            _, day, discipline, metric = path.split(".")
+            metrics = doc["days"].setdefault(day, {}).setdefault(discipline, defaultdict(float))
+            metrics[metric] += value
+    return docs
+
+def test_week_of_uses_iso_weeks():
+    assert week_of("2024-02-01") == {"week": "2024-W05", "weekStart": "2024-01-29"}
+    assert week_of("2024-12-30") == {"week": "2025-W01", "weekStart": "2024-12-30"}
+
+def test_group_by_week_month_and_discipline():
+    weeks = list(_apply({}, _deltas([], WORKOUTS)).values())
+    assert len(weeks) == 2
+
+    by_week = summarize(weeks, None, None, "week")
+    assert [(g["key"], g["sessions"]) for g in by_week["groups"]] == [("2024-W05", 3), ("2024-W06", 1)]
+    assert by_week["totals"] == {"sessions": 4, "totalDuration": 225, "totalLoad": 1440, "avgIntensity": 6.5}
+
+    by_month = summarize(weeks, None, None, "month")
+    assert [(g["key"], g["sessions"]) for g in by_month["groups"]] == [("2024-01", 2), ("2024-02", 2)]
+
+    by_discipline = summarize(weeks, "2024-01-30", "2024-02-04", "discipline")
+    assert [(g["key"], g["totalDuration"]) for g in by_discipline["groups"]] == [("BJJ", 90), ("Boxing", 30)]
+
+def test_update_and_delete_deltas_cancel_out():
+    docs = _apply({}, _deltas([], WORKOUTS))
+    moved = {**WORKOUTS[0], "date": "2024-02-06", "duration": 30}
+    _apply(docs, _deltas([WORKOUTS[0]], [moved]))
+    _apply(docs, _deltas([WORKOUTS[3]], []))
+
+    stats = summarize(docs.values(), None, None, "week")
+    assert [(g["key"], g["sessions"], g["totalDuration"]) for g in stats["groups"]] == [
+        ("2024-W05", 2, 120), ("2024-W06", 1, 30),
+    ]
+
+def test_stats_rejects_impossible_dates(authed_client):
+    res = authed_client.get("/api/workouts/stats", params={"start": "2024-02-30"})
+    assert res.status_code == 400
+
+def test_rebuild_streams_sorted_groups_into_week_documents(monkeypatch):
+    rows = [
+        {"_id": {"userId": user, "date": w["date"], "discipline": w["discipline"]},
+         "sessions": 1, "duration": w["duration"], "intensity": w["intensity"],
+         "load": w["duration"] * w["intensity"]}
+        for user in ("a", "b") for w in WORKOUTS
+    ]
+    inserted = []
+
+    async def aggregate(pipeline, allowDiskUse):
+        assert pipeline[-1] == {"$sort": {"_id.userId": 1, "_id.date": 1}}
+        for row in rows:
+            yield row
+
+    async def noop(*args, **kwargs):
+        pass
+
+    async def insert_many(docs, ordered):
+        inserted.extend(docs)
+
+    database = SimpleNamespace(
+        workouts=SimpleNamespace(aggregate=aggregate),
+        weekly_stats=SimpleNamespace(delete_many=noop, insert_many=insert_many),
+    )
+    monkeypatch.setattr(db, "get_db", lambda: database)
+
+    assert asyncio.run(weekly_stats.rebuild()) == 4
+    assert [(d["userId"], d["weekStart"]) for d in inserted] == [
+        ("a", "2024-01-29"), ("a", "2024-02-05"), ("b", "2024-01-29"), ("b", "2024-02-05"),
+    ]
+    expected = _apply({}, _deltas([], WORKOUTS)).values()
+    assert summarize(inserted[:2], None, None, "week") == summarize(expected, None, None, "week")
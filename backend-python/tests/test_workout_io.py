@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app import workout_io
+from app.database import db
+from app.routes import workouts
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+def _rows(parser, data: bytes, size: int = 7, max_bytes: int = 1024):
+    async def collect():
+        lines = workout_io.iter_lines(_chunks(data, size), max_bytes)
+        if parser is workout_io.iter_csv:
+            return [r async for r in parser(lines, max_bytes)]
+        return [r async for r in parser(lines)]
+    return asyncio.run(collect())
+
+def _validate(rows):
+    results = []
+    for row, data in rows:
+        try:
+            results.append((row, workout_io.validate_row(data).model_dump()))
+        except Exception as e:
+            results.append((row, workout_io.describe_error(e)))
+    return results
+
+def test_ndjson_rows_are_split_across_chunks():
+    data = (
+        b'{"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-01"}\n'
+        b'\n'
+        b'{"discipline": "Boxing", "duration": 30, "intensity": 8, "date": "2024-01-02"}'
+    )
+    rows = _validate(_rows(workout_io.iter_ndjson, data))
+    assert [r for r, _ in rows] == [1, 3]
+    assert rows[1][1]["discipline"] == "Boxing"
+
+def test_ndjson_reports_bad_rows():
+    data = b'{"discipline": "Karate", "duration": 60, "intensity": 5, "date": "2024-01-01"}\n{oops\n[1]\n'
+    rows = _validate(_rows(workout_io.iter_ndjson, data))
+    assert rows[0][1].startswith("discipline:")
+    assert rows[1][1].startswith("Invalid JSON")
+    assert rows[2][1] == "Expected an object"
+
+def test_csv_with_quoted_multiline_notes():
+    data = (
+        b"discipline,duration,intensity,date,notes\r\n"
+        b'Muay Thai,45,7,2024-02-01,"Clinch work,\nthen ""pads"""\r\n'
+        b"Wrestling,abc,5,2024-02-02,\r\n"
+        b"Cardio,30,4\r\n"
+    )
+    rows = _validate(_rows(workout_io.iter_csv, data, size=5))
+    assert rows[0] == (1, {
+        "discipline": "Muay Thai", "duration": 45, "intensity": 7,
+        "notes": 'Clinch work,\nthen "pads"', "date": "2024-02-01",
+    })
+    assert rows[1][0] == 2 and rows[1][1].startswith("duration:")
+    assert rows[2] == (3, "Expected 5 columns, got 3")
+
+def test_oversized_lines_become_error_rows():
+    good = b'{"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-01"}'
+    for size in (7, 4096):
+        rows = _validate(_rows(workout_io.iter_ndjson, good + b"\n" + b"x" * 500 + b"\n" + good, size, 100))
+        assert rows[0][1]["discipline"] == "BJJ"
+        assert rows[1] == (2, "Line exceeds 100 bytes")
+        assert rows[2][0] == 3 and rows[2][1]["discipline"] == "BJJ"
+
+    # No newline at all: the buffer is dropped, not grown
+    assert _validate(_rows(workout_io.iter_ndjson, b"x" * 10_000, 7, 100)) == [(1, "Line exceeds 100 bytes")]
+
+def test_invalid_utf8_rows_are_reported_in_place():
+    good = '{"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-01", "notes": "caf\u00e9"}'.encode()
+    latin1 = b'{"discipline": "BJJ", "duration": 60, "intensity": 5, "date": "2024-01-02", "notes": "caf\xe9"}'
+    rows = _validate(_rows(workout_io.iter_ndjson, good + b"\n" + latin1 + b"\n" + good))
+    assert rows[0][1]["notes"] == "caf\u00e9"
+    assert rows[1][0] == 2 and rows[1][1].startswith("Invalid UTF-8")
+    assert rows[2][0] == 3 and rows[2][1]["notes"] == "caf\u00e9"
+
+    csv_rows = _validate(_rows(workout_io.iter_csv, b"discipline,duration,intensity,date,notes\n"
+                               b"BJJ,60,5,2024-01-01,caf\xe9\nBJJ,60,5,2024-01-02,ok\n"))
+    assert csv_rows[0][0] == 1 and csv_rows[0][1].startswith("Invalid UTF-8")
+    assert csv_rows[1] == (2, {"discipline": "BJJ", "duration": 60, "intensity": 5, "notes": "ok", "date": "2024-01-02"})
+
+def test_csv_stray_quote_is_bounded():
+    data = (
+        b"discipline,duration,intensity,date\n"
+        b'Boxing,30,8,2024-01-02 "oops\n'
+        + b"Cardio,30,4,2024-01-03\n" * 10
+    )
+    rows = _validate(_rows(workout_io.iter_csv, data, max_bytes=100))
+    assert rows[0][1].startswith("Record exceeds 100 bytes")
+    # Parsing resumes after the abandoned record
+    assert len(rows) > 1 and all(r[1]["discipline"] == "Cardio" for r in rows[1:])
+
+def test_export_round_trips_through_import():
+    docs = [{
+        "_id": ObjectId(), "discipline": "BJJ", "duration": 60, "intensity": 5,
+        "notes": 'Half guard, "knee shield"\nsweeps', "date": "2024-01-01",
+        "createdAt": datetime(2024, 1, 1, 10), "updatedAt": datetime(2024, 1, 1, 10),
+    }]
+    for parser, text in (
+        (workout_io.iter_ndjson, workout_io.ndjson_chunk(docs)),
+        (workout_io.iter_csv, workout_io.csv_chunk(docs, header=True)),
+    ):
+        [(row, data)] = _rows(parser, text.encode())
+        assert data["id"] == str(docs[0]["_id"])
+        assert data["createdAt"] == "2024-01-01T10:00:00"
+        assert workout_io.validate_row(data).notes == docs[0]["notes"]
+
+def test_import_keeps_rows_written_before_a_bulk_write_error(monkeypatch, authed_client):
+    async def insert_many(docs, ordered):
+        raise BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "duplicate key"}], "nInserted": 2})
+
+    changed = []
+
+    async def on_changed(user_id, removed=(), added=()):
+        changed.extend(added)
+
+    monkeypatch.setattr(db, "get_db", lambda: SimpleNamespace(workouts=SimpleNamespace(insert_many=insert_many)))
+    monkeypatch.setattr(workouts, "_on_workouts_changed", on_changed)
+    body = "".join(
+        f'{{"discipline": "BJJ", "duration": {d}, "intensity": 5, "date": "2024-01-01"}}\n' for d in (30, 45, 60)
+    )
+    res = authed_client.post("/api/workouts/import?format=ndjson", content=body)
+
+    assert res.status_code == 201
+    assert res.json()["imported"] == 2
+    assert res.json()["errors"] == [{"row": 2, "error": "duplicate key"}]
+    assert [d["duration"] for d in changed] == [30, 60]
@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+from app.config import settings
+from app.workout_storage import storage_fields
+
+def test_plain_collection_adds_no_fields(monkeypatch):
+    monkeypatch.setattr(settings, "workout_storage", "collection")
+    assert storage_fields({"date": "2024-03-05"}) == {}
+
+def test_timeseries_adds_utc_session_time(monkeypatch):
+    monkeypatch.setattr(settings, "workout_storage", "timeseries")
+    assert storage_fields({"date": "2024-03-05"}) == {"ts": datetime(2024, 3, 5, tzinfo=timezone.utc)}
+    assert storage_fields({"date": "2024-03-05T18:30:00"})["ts"].day == 5
+    assert storage_fields({"notes": "no date change"}) == {}